@@ -0,0 +1,5 @@
+"""Shared helpers for running the daily Python solvers.
+
+Every `dayN/python/main.py` exposes `solve(part, lines)`, so the days can be
+run one at a time as scripts or all together with `python -m aoc`.
+"""
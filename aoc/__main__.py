@@ -0,0 +1,312 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from aoc import bench, generators, profiling
+from aoc.cache import ResultCache
+from aoc.io import INPUT_NAMES
+from aoc.runner import Result, discover_days, make_jobs, run, run_parallel
+
+
+def add_job_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("days", nargs="*", type=int, help="days to run (default: all)")
+    parser.add_argument("-p", "--parts", nargs="+", type=int, default=[1, 2])
+    parser.add_argument("-i", "--inputs", nargs="+", default=list(INPUT_NAMES))
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m aoc", description="Run Advent of Code solvers in one process"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run solvers and print answers")
+    add_job_args(run_parser)
+    run_parser.add_argument(
+        "--profile", action="store_true", help="time the phases of every solver"
+    )
+    run_parser.add_argument(
+        "--cprofile", nargs="+", default=[], metavar="PHASE", help='or "*" for all'
+    )
+    run_parser.add_argument(
+        "--tracemalloc", nargs="+", default=[], metavar="PHASE", help='or "*" for all'
+    )
+    run_parser.add_argument("--profile-dir", type=Path, default=None)
+    run_parser.add_argument(
+        "--no-cache", action="store_true", help="always recompute the answers"
+    )
+    run_parser.add_argument("--clear-cache", action="store_true")
+    run_parser.add_argument(
+        "-j",
+        "--jobs",
+        nargs="?",
+        type=int,
+        const=0,
+        default=None,
+        metavar="N",
+        help="run in a pool of N processes (default: one per CPU)",
+    )
+    run_parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=bench.DEFAULT_BASELINE,
+        help="benchmark results used to start the longest jobs first",
+    )
+
+    bench_parser = subparsers.add_parser("bench", help="benchmark solvers")
+    add_job_args(bench_parser)
+    bench_parser.add_argument("--warmup", type=int, default=1)
+    bench_parser.add_argument("--repeat", type=int, default=5)
+    bench_parser.add_argument(
+        "--budget", type=float, default=10.0, help="max seconds of timed runs per job"
+    )
+    bench_parser.add_argument("--baseline", type=Path, default=bench.DEFAULT_BASELINE)
+    bench_parser.add_argument(
+        "--save", action="store_true", help="store the results as the new baseline"
+    )
+    bench_parser.add_argument(
+        "--threshold", type=float, default=0.1, help="allowed relative slowdown"
+    )
+    bench_parser.add_argument(
+        "--sweep",
+        type=int,
+        default=None,
+        metavar="DAY",
+        help="benchmark DAY on generated inputs of every size in --sizes",
+    )
+    bench_parser.add_argument(
+        "--sizes", nargs="+", type=int, default=[100, 1000, 10000], metavar="N"
+    )
+    bench_parser.add_argument("--seed", type=int, default=0)
+    bench_parser.add_argument(
+        "--startup",
+        action="store_true",
+        help="time interpreter startup and imports of each day, in a fresh process",
+    )
+
+    gen_parser = subparsers.add_parser("gen", help="generate a scaled-up input")
+    gen_parser.add_argument("day", type=int, choices=sorted(generators.GENERATORS))
+    gen_parser.add_argument(
+        "--size", type=int, required=True, help="see SIZE_UNITS in aoc/generators.py"
+    )
+    gen_parser.add_argument("--seed", type=int, default=0)
+    gen_parser.add_argument(
+        "-o", "--output", type=Path, default=None, help="default: .aoc_gen/"
+    )
+
+    return parser.parse_args(argv)
+
+
+def print_result(result: Result) -> None:
+    job = result.job
+    answer = result.answer if result.ok else f"ERROR {result.error}"
+    print(
+        f"day{job.day:<3} part {job.part}  {job.input_name:<10}"
+        f"{result.seconds * 1000:>10.2f} ms  {answer}"
+        f"{'  (cached)' if result.cached else ''}"
+    )
+
+    for name, seconds in result.phases.items():
+        print(f"{'':<22}{name:<10}{seconds * 1000:>10.2f} ms")
+
+
+def print_measurement(m: bench.Measurement) -> None:
+    if m.error is not None:
+        print(f"{m.key:<24} ERROR {m.error}")
+        return
+
+    print(
+        f"{m.key:<24} wall {m.wall_min * 1000:>10.2f} ms"
+        f"  median {m.wall_median * 1000:>10.2f} ms"
+        f"  cpu {m.cpu_min * 1000:>10.2f} ms"
+        f"  peak {m.peak_bytes / 2**20:>8.2f} MiB  ({m.runs} runs)"
+    )
+
+
+def print_sweep(points: list[bench.SweepPoint], width: int = 50) -> None:
+    """A table of the sweep plus a bar per size, scaled to the slowest run."""
+    slowest = max((p.measurement.wall_min for p in points), default=0.0)
+
+    for part in sorted({p.part for p in points}):
+        print(f"part {part}")
+        part_points = [p for p in points if p.part == part]
+
+        for p in part_points:
+            m = p.measurement
+            if m.error is not None:
+                print(f"{p.size:>10}  ERROR {m.error}")
+                continue
+
+            check = {True: "ok", False: f"expected {p.expected}", None: ""}[p.matches]
+            bar = "#" * round(width * m.wall_min / slowest) if slowest else ""
+            print(
+                f"{p.size:>10}{m.wall_min * 1000:>12.2f} ms"
+                f"{m.peak_bytes / 2**20:>10.2f} MiB  {bar:<{width}}  {check}"
+            )
+
+        exponent = bench.growth_exponent(
+            [
+                (p.size, p.measurement.wall_min)
+                for p in part_points
+                if p.measurement.error is None
+            ]
+        )
+        if exponent is not None:
+            print(f"{'':>10}runtime grows like size^{exponent:.2f}")
+
+
+def run_command(args: argparse.Namespace) -> int:
+    if args.profile or args.cprofile or args.tracemalloc:
+        settings = profiling.configure(
+            enabled=True,
+            cprofile=frozenset(args.cprofile),
+            tracemalloc=frozenset(args.tracemalloc),
+        )
+        if args.profile_dir is not None:
+            settings = profiling.configure(out_dir=args.profile_dir)
+        print("Writing profiles to", settings.out_dir)
+
+    cache = ResultCache()
+    if args.clear_cache:
+        cache.clear()
+
+    # A cache hit would skip the solver entirely, so profiling always recomputes
+    use_cache = not args.no_cache and not profiling.is_enabled()
+
+    days = args.days or list(discover_days())
+    jobs = make_jobs(days, args.parts, args.inputs)
+
+    if args.jobs is None:
+        results = run(jobs, cache if use_cache else None)
+        for result in results:
+            print_result(result)
+
+        return 0 if all(r.ok for r in results) else 1
+
+    expected: dict[str, float] = {}
+    if args.baseline.exists():
+        baseline = bench.load_baseline(args.baseline)
+        expected = {key: m.wall_min for key, m in baseline.items()}
+
+    start = time.perf_counter()
+    results = []
+    for result in run_parallel(
+        jobs, args.jobs or None, cache if use_cache else None, expected
+    ):
+        print_result(result)
+        results.append(result)
+    elapsed = time.perf_counter() - start
+
+    # Wall times of jobs sharing CPUs overlap, so estimate the serial run from
+    # their CPU times
+    serial = sum(r.cpu_seconds for r in results)
+    print(
+        f"Total {elapsed:.2f} s wall, {serial:.2f} s of solver CPU time "
+        f"({serial / elapsed if elapsed else 0:.2f}x speedup over a serial run)"
+    )
+
+    return 0 if all(r.ok for r in results) else 1
+
+
+def startup_command(args: argparse.Namespace) -> int:
+    days = args.days or list(discover_days())
+
+    for day in days:
+        s = bench.measure_startup(day, max(args.repeat, 1))
+        imports = ", ".join(
+            f"{module} {seconds * 1000:.1f} ms" for module, seconds in s.imports
+        )
+        print(
+            f"day{day:<3} startup {s.wall_min * 1000:>8.2f} ms"
+            f"  (interpreter {s.interpreter_min * 1000:.2f} ms)  {imports}"
+        )
+
+    return 0
+
+
+def sweep_command(args: argparse.Namespace) -> int:
+    points: list[bench.SweepPoint] = []
+    for point in bench.sweep(
+        args.sweep,
+        args.sizes,
+        args.parts,
+        args.seed,
+        args.warmup,
+        args.repeat,
+        args.budget,
+    ):
+        print(
+            f"day{args.sweep} part {point.part} size {point.size}: "
+            f"{point.measurement.wall_min * 1000:.2f} ms"
+        )
+        points.append(point)
+
+    print()
+    print_sweep(points)
+
+    return 0 if all(p.matches is not False for p in points) else 1
+
+
+def gen_command(args: argparse.Namespace) -> int:
+    output = args.output or bench.generated_input(
+        args.day, args.size, args.seed, bench.GENERATED_DIR
+    )
+    answers = generators.generate(args.day, args.size, args.seed, output)
+
+    print("Wrote", output)
+    for part, answer in answers.items():
+        print(f"part {part}: {answer}")
+
+    return 0
+
+
+def bench_command(args: argparse.Namespace) -> int:
+    if args.sweep is not None:
+        return sweep_command(args)
+    if args.startup:
+        return startup_command(args)
+
+    days = args.days or list(discover_days())
+    jobs = make_jobs(days, args.parts, args.inputs)
+
+    measurements: list[bench.Measurement] = []
+    for job in jobs:
+        m = bench.measure(job, args.warmup, args.repeat, args.budget)
+        print_measurement(m)
+        measurements.append(m)
+
+    regressions: list[bench.Regression] = []
+    if args.baseline.exists():
+        baseline = bench.load_baseline(args.baseline)
+        regressions = bench.find_regressions(measurements, baseline, args.threshold)
+
+        for r in regressions:
+            print(
+                f"REGRESSION {r.key} {r.metric}: "
+                f"{r.baseline:.6g} -> {r.current:.6g} ({r.ratio:.2f}x)"
+            )
+
+    if args.save:
+        bench.save_baseline(measurements, args.baseline)
+        print("Saved baseline to", args.baseline)
+
+    return 1 if regressions else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    match args.command:
+        case "run":
+            return run_command(args)
+        case "bench":
+            return bench_command(args)
+        case "gen":
+            return gen_command(args)
+
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
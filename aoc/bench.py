@@ -0,0 +1,297 @@
+import json
+import math
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from aoc import generators
+from aoc.runner import ROOT, Job, discover_days, load_solver, solve_job
+
+DEFAULT_BASELINE = ROOT / "benchmarks" / "baseline.json"
+GENERATED_DIR = ROOT / ".aoc_gen"
+
+# Timings below this many seconds are too noisy to flag as regressions
+NOISE_FLOOR = 1e-3
+
+# "import time: <self us> | <cumulative us> | <indent><module>" from -X importtime
+IMPORTTIME_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)")
+
+
+@dataclass(frozen=True)
+class Measurement:
+    key: str
+    answer: int | None
+    runs: int
+    wall_min: float
+    wall_median: float
+    cpu_min: float
+    peak_bytes: int
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class Regression:
+    key: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+
+def reset_caches(job: Job) -> None:
+    """Clear `functools.cache`d helpers so repeated runs measure a cold solve."""
+    for obj in vars(load_solver(job.day)).values():
+        if callable(getattr(obj, "cache_clear", None)):
+            obj.cache_clear()
+
+
+def trace_peak_memory(job: Job) -> tuple[int, int]:
+    """Run a job once under tracemalloc, return (answer, peak bytes allocated)."""
+    reset_caches(job)
+    tracemalloc.start()
+    try:
+        answer = solve_job(job)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return answer, peak
+
+
+def measure(
+    job: Job, warmup: int = 1, repeat: int = 5, budget: float = 10.0
+) -> Measurement:
+    """Benchmark a single job.
+
+    The first warmup run is traced to get the peak memory (or one extra run is
+    made when `warmup` is 0), the remaining runs are timed. Timed runs stop early
+    once `budget` seconds have been spent, but at least one run is always made.
+    """
+    try:
+        answer, peak = trace_peak_memory(job)
+        for _ in range(warmup - 1):
+            reset_caches(job)
+            solve_job(job)
+
+        walls: list[float] = []
+        cpus: list[float] = []
+        for _ in range(max(repeat, 1)):
+            reset_caches(job)
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            solve_job(job)
+            walls.append(time.perf_counter() - wall_start)
+            cpus.append(time.process_time() - cpu_start)
+
+            if sum(walls) > budget:
+                break
+    except Exception as e:
+        return Measurement(
+            job.key, None, 0, 0.0, 0.0, 0.0, 0, f"{type(e).__name__}: {e}"
+        )
+
+    return Measurement(
+        key=job.key,
+        answer=answer,
+        runs=len(walls),
+        wall_min=min(walls),
+        wall_median=statistics.median(walls),
+        cpu_min=min(cpus),
+        peak_bytes=peak,
+    )
+
+
+@dataclass(frozen=True)
+class SweepPoint:
+    size: int
+    part: int
+    measurement: Measurement
+    expected: int | None
+
+    @property
+    def matches(self) -> bool | None:
+        """Whether the answer is the generator's, None when it did not know it."""
+        if self.expected is None or self.measurement.error is not None:
+            return None
+
+        return self.measurement.answer == self.expected
+
+
+def generated_input(day: int, size: int, seed: int, out_dir: Path) -> Path:
+    return out_dir / f"day{day}-size{size}-seed{seed}.txt"
+
+
+def sweep(
+    day: int,
+    sizes: Iterable[int],
+    parts: Iterable[int] = (1, 2),
+    seed: int = 0,
+    warmup: int = 1,
+    repeat: int = 5,
+    budget: float = 10.0,
+    out_dir: Path = GENERATED_DIR,
+) -> Iterator[SweepPoint]:
+    """Benchmark a day on generated inputs of growing size."""
+    parts = tuple(parts)
+
+    for size in sizes:
+        path = generated_input(day, size, seed, out_dir)
+        answers = generators.generate(day, size, seed, path)
+
+        for part in parts:
+            m = measure(Job(day, part, str(path)), warmup, repeat, budget)
+            yield SweepPoint(size, part, m, answers.get(part))
+
+
+def growth_exponent(points: list[tuple[int, float]]) -> float | None:
+    """Slope of a least squares fit of log(seconds) over log(size).
+
+    About 1 means linear growth, 2 quadratic and so on. Points under the noise
+    floor are left out, None when fewer than two are left.
+    """
+    logs = [(math.log(size), math.log(t)) for size, t in points if t >= NOISE_FLOOR]
+    if len(logs) < 2:
+        return None
+
+    mean_x = sum(x for x, _ in logs) / len(logs)
+    mean_y = sum(y for _, y in logs) / len(logs)
+    var_x = sum((x - mean_x) ** 2 for x, _ in logs)
+    if not var_x:
+        return None
+
+    return sum((x - mean_x) * (y - mean_y) for x, y in logs) / var_x
+
+
+@dataclass(frozen=True)
+class Startup:
+    day: int
+    runs: int
+    wall_min: float
+    interpreter_min: float
+    imports: list[tuple[str, float]]
+
+
+def top_level_imports(importtime: str) -> dict[str, float]:
+    """Seconds spent on each top-level import, from `-X importtime` output."""
+    imports: dict[str, float] = {}
+    for match in IMPORTTIME_LINE.finditer(importtime):
+        cumulative, indent, module = match.groups()
+        if not indent:
+            imports[module] = int(cumulative) / 1e6
+
+    return imports
+
+
+def _time_command(args: list[str], repeat: int) -> float:
+    walls: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(args, capture_output=True, check=True)
+        walls.append(time.perf_counter() - start)
+
+    return min(walls)
+
+
+def measure_startup(day: int, repeat: int = 10, top_n: int = 5) -> Startup:
+    """Time starting a fresh interpreter and importing a day's solver.
+
+    The solver is imported the way `load_solver` does it, without running
+    `main`, so only what it loads up front is counted and not what `solve`
+    imports lazily. The imports are taken from one extra run under
+    `-X importtime`, leaving out the ones the bare interpreter makes anyway,
+    heaviest first.
+    """
+    solver_file = discover_days()[day]
+    loader = "import importlib.util as u"
+    command = [
+        sys.executable,
+        "-c",
+        f"{loader}; s = u.spec_from_file_location('solver', {str(solver_file)!r}); "
+        "s.loader.exec_module(u.module_from_spec(s))",
+    ]
+    bare = [sys.executable, "-c", loader]
+
+    # Warm up the OS file cache and the bytecode cache first
+    subprocess.run(command, capture_output=True, check=True)
+
+    interpreter = subprocess.run(
+        [sys.executable, "-X", "importtime", *bare[1:]],
+        capture_output=True,
+        text=True,
+    )
+    solver = subprocess.run(
+        [sys.executable, "-X", "importtime", *command[1:]],
+        capture_output=True,
+        text=True,
+    )
+    startup_imports = top_level_imports(interpreter.stderr)
+    imports = {
+        module: seconds
+        for module, seconds in top_level_imports(solver.stderr).items()
+        if module not in startup_imports
+    }
+    heaviest = sorted(imports.items(), key=lambda item: item[1], reverse=True)
+
+    return Startup(
+        day=day,
+        runs=repeat,
+        wall_min=_time_command(command, repeat),
+        interpreter_min=_time_command(bare, repeat),
+        imports=heaviest[:top_n],
+    )
+
+
+def save_baseline(
+    measurements: list[Measurement], path: Path = DEFAULT_BASELINE
+) -> None:
+    data = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {m.key: asdict(m) for m in measurements if m.error is None},
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def load_baseline(path: Path = DEFAULT_BASELINE) -> dict[str, Measurement]:
+    with open(path, "r") as f:
+        data = json.load(f)
+
+    return {key: Measurement(**m) for key, m in data["results"].items()}
+
+
+def find_regressions(
+    measurements: list[Measurement],
+    baseline: dict[str, Measurement],
+    threshold: float = 0.1,
+) -> list[Regression]:
+    """Compare against a baseline, `threshold` is the allowed relative slowdown."""
+    regressions: list[Regression] = []
+
+    for m in measurements:
+        if m.error is not None or m.key not in baseline:
+            continue
+
+        old = baseline[m.key]
+        for metric in ("wall_min", "cpu_min", "peak_bytes"):
+            old_value, new_value = getattr(old, metric), getattr(m, metric)
+            if metric != "peak_bytes" and new_value < NOISE_FLOOR:
+                continue
+            if new_value > old_value * (1 + threshold):
+                regressions.append(Regression(m.key, metric, old_value, new_value))
+
+    return regressions
@@ -0,0 +1,124 @@
+"""On-disk cache of solver answers.
+
+Entries are keyed on the day, part, the input file's bytes and the source of the
+solver (including the `aoc` modules it uses), so editing either one invalidates
+the answer. The cache is capped in size and evicts the least recently used
+entries first.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+from pathlib import Path
+from types import ModuleType
+
+from aoc.io import input_path
+from aoc.runner import ROOT, Job, load_solver
+
+DEFAULT_DIR = Path(os.environ.get("AOC_CACHE_DIR", ROOT / ".aoc_cache"))
+DEFAULT_MAX_BYTES = 16 * 2**20
+
+
+def _file_digest(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def solver_sources(solver: ModuleType) -> list[Path]:
+    """The solver file plus every `aoc` module it pulls names from."""
+    sources = {Path(solver.__file__)}
+
+    for obj in vars(solver).values():
+        module_name = (
+            obj.__name__ if inspect.ismodule(obj) else getattr(obj, "__module__", None)
+        )
+        if not isinstance(module_name, str) or not module_name.startswith("aoc"):
+            continue
+
+        module = sys.modules.get(module_name)
+        if module is not None and getattr(module, "__file__", None):
+            sources.add(Path(module.__file__))
+
+    return sorted(sources)
+
+
+class ResultCache:
+    def __init__(
+        self, cache_dir: Path = DEFAULT_DIR, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._source_digests: dict[int, str] = {}
+
+    def source_digest(self, day: int) -> str:
+        if day not in self._source_digests:
+            h = hashlib.sha256()
+            for source in solver_sources(load_solver(day)):
+                h.update(_file_digest(source).encode())
+            self._source_digests[day] = h.hexdigest()
+
+        return self._source_digests[day]
+
+    def key(self, job: Job) -> str | None:
+        """The cache key of a job, None when its input cannot be hashed up front."""
+        solver = load_solver(job.day)
+        path = input_path(solver.__file__, job.input_name)
+        if path is None:
+            return None
+
+        input_digest = _file_digest(path)
+
+        h = hashlib.sha256()
+        h.update(f"day{job.day}/part{job.part}".encode())
+        h.update(input_digest.encode())
+        h.update(self.source_digest(job.day).encode())
+
+        return h.hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, job: Job) -> int | None:
+        if (key := self.key(job)) is None:
+            return None
+
+        entry = self._entry(key)
+        try:
+            with open(entry, "r") as f:
+                answer = json.load(f)["answer"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return None
+
+        # Touch the entry so eviction sees it as recently used
+        os.utime(entry)
+        return answer
+
+    def put(self, job: Job, answer: int) -> None:
+        if (key := self.key(job)) is None:
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        entry = self._entry(key)
+        tmp = entry.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"job": job.key, "answer": answer}, f)
+        tmp.replace(entry)
+
+        self.evict()
+
+    def evict(self) -> None:
+        entries = [(p.stat(), p) for p in self.cache_dir.glob("*.json")]
+        total = sum(stat.st_size for stat, _ in entries)
+
+        for stat, path in sorted(entries, key=lambda e: e[0].st_mtime):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+
+    def clear(self) -> None:
+        for path in self.cache_dir.glob("*.json"):
+            path.unlink(missing_ok=True)
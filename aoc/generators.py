@@ -0,0 +1,551 @@
+"""Seeded generators for scaled-up puzzle inputs.
+
+Every generator writes a valid input for its day to `out` and returns the
+answers it knows, as {part: answer}. Answers are only included when they fall
+out of the construction cheaply; otherwise the part is left out.
+
+What `size` means depends on the day, see `SIZE_UNITS`.
+"""
+
+import math
+import random
+from pathlib import Path
+from typing import Callable, Iterable, TextIO
+
+from aoc.runner import load_solver
+
+type Answers = dict[int, int]
+type Generator = Callable[[random.Random, int, TextIO], Answers]
+
+SIZE_UNITS = {
+    1: "lines",
+    2: "games",
+    6: "races",
+    7: "hands",
+    8: "nodes",
+    9: "histories",
+    10: "grid side",
+    11: "grid side",
+    12: "springs per row",
+    13: "patterns",
+    14: "grid side",
+    15: "steps",
+    16: "grid side",
+}
+
+DIGIT_WORDS = ("one", "two", "three", "four", "five", "six", "seven", "eight", "nine")
+
+# None of these letters appear in a digit word, so filler can never spell one
+SAFE_LETTERS = "abcdjklmpqyz"
+
+
+def day1(rng: random.Random, size: int, out: TextIO) -> Answers:
+    part1 = part2 = 0
+
+    for _ in range(size):
+        num_tokens = rng.randint(1, 8)
+        digit_idx = rng.randrange(num_tokens)
+
+        chunks: list[str] = []
+        digits: list[int] = []
+        values: list[int] = []
+        for i in range(num_tokens):
+            chunks.append("".join(rng.choices(SAFE_LETTERS, k=rng.randint(0, 4))))
+
+            value = rng.randint(1, 9)
+            if i == digit_idx or rng.random() < 0.4:
+                chunks.append(str(value))
+                digits.append(value)
+            else:
+                chunks.append(DIGIT_WORDS[value - 1])
+            values.append(value)
+        chunks.append("".join(rng.choices(SAFE_LETTERS, k=rng.randint(0, 4))))
+
+        part1 += digits[0] * 10 + digits[-1]
+        part2 += values[0] * 10 + values[-1]
+        out.write("".join(chunks) + "\n")
+
+    return {1: part1, 2: part2}
+
+
+def day2(rng: random.Random, size: int, out: TextIO) -> Answers:
+    bag = {"red": 12, "green": 13, "blue": 14}
+    part1 = part2 = 0
+
+    for game_id in range(1, size + 1):
+        max_cubes = dict.fromkeys(bag, 0)
+
+        sets: list[str] = []
+        for set_idx in range(rng.randint(1, 6)):
+            # The first set shows every color, a power never misses a factor
+            colors = rng.sample(list(bag), 3 if set_idx == 0 else rng.randint(1, 3))
+
+            cubes: list[str] = []
+            for color in colors:
+                quant = rng.randint(1, 20)
+                max_cubes[color] = max(max_cubes[color], quant)
+                cubes.append(f"{quant} {color}")
+            sets.append(", ".join(cubes))
+
+        if all(max_cubes[color] <= bag[color] for color in bag):
+            part1 += game_id
+        part2 += math.prod(max_cubes.values())
+
+        out.write(f"Game {game_id}: {'; '.join(sets)}\n")
+
+    return {1: part1, 2: part2}
+
+
+def day6(rng: random.Random, size: int, out: TextIO) -> Answers:
+    times = [rng.randint(10, 99) for _ in range(size)]
+    dists = [rng.randint(1, t * t // 4 - 1) for t in times]
+
+    out.write("Time:     " + " ".join(f"{t:>6}" for t in times) + "\n")
+    out.write("Distance: " + " ".join(f"{d:>6}" for d in dists) + "\n")
+
+    # Counted by the solver's own maths, so the answers cannot drift from it
+    count_wins = load_solver(6).count_series_points
+    part1 = math.prod(count_wins(t, d) for t, d in zip(times, dists))
+    part2 = count_wins(int("".join(map(str, times))), int("".join(map(str, dists))))
+
+    return {1: part1, 2: part2}
+
+
+def day7(rng: random.Random, size: int, out: TextIO) -> Answers:
+    # Past 13^5 hands repeats are unavoidable. Repeated hands always get the same
+    # bid, so the total winnings do not depend on how ties are ranked.
+    bids: dict[str, int] = {}
+    for _ in range(size):
+        hand = "".join(rng.choices("23456789TJQKA", k=5))
+        if hand not in bids:
+            bids[hand] = rng.randint(1, 1000)
+
+        out.write(f"{hand} {bids[hand]}\n")
+
+    return {}
+
+
+def _node_name(idx: int, last: str, width: int) -> str:
+    letters = "BCDEFGHIJKLMNOPQRSTUVWXY"
+    chars: list[str] = []
+    for _ in range(width - 1):
+        idx, rem = divmod(idx, len(letters))
+        chars.append(letters[rem])
+
+    return "".join(chars) + last
+
+
+def day8(rng: random.Random, size: int, out: TextIO) -> Answers:
+    """Six ghosts, each on its own chain that loops back from its Z node.
+
+    Both edges of a chain node lead to the next node, so the first Z hit of
+    every ghost equals its period and part 2 is the lcm of the chain lengths.
+    Like in the puzzle inputs, every chain length is a multiple of the number of
+    instructions, so a ghost's walk also repeats in (node, instruction) states
+    once per chain. The nodes left over from `size` form a random tangle that no
+    ghost reaches.
+    """
+    num_ghosts = 6
+    size = max(size, num_ghosts * 3)
+    width = max(3, math.ceil(math.log(size, 24)) + 1)
+    num_instructions = max(1, min(10_000, size // 50))
+
+    min_passes = max(
+        math.ceil(2 / num_instructions), size // (2 * num_ghosts) // num_instructions
+    )
+    max_passes = max(min_passes, size // num_ghosts // num_instructions)
+    chain_lens = [
+        num_instructions * rng.randint(min_passes, max_passes)
+        for _ in range(num_ghosts)
+    ]
+
+    edges: dict[str, tuple[str, str]] = {}
+    next_id = 0
+    for ghost, chain_len in enumerate(chain_lens):
+        if ghost == 0:
+            start, end = "AAA", "ZZZ"
+        else:
+            start, end = _node_name(ghost, "A", width), _node_name(ghost, "Z", width)
+
+        middle = [_node_name(next_id + i, "B", width) for i in range(chain_len - 1)]
+        next_id += chain_len - 1
+
+        chain = [start, *middle, end]
+        for node, succ in zip(chain, chain[1:]):
+            edges[node] = (succ, succ)
+        edges[end] = (chain[1], chain[1])
+
+    noise = [_node_name(next_id + i, "C", width) for i in range(size - len(edges))]
+    for node in noise:
+        edges[node] = (rng.choice(noise), rng.choice(noise))
+
+    out.write("".join(rng.choices("LR", k=num_instructions)) + "\n\n")
+
+    nodes = list(edges)
+    rng.shuffle(nodes)
+    for node in nodes:
+        left, right = edges[node]
+        out.write(f"{node} = ({left}, {right})\n")
+
+    return {1: chain_lens[0], 2: math.lcm(*chain_lens)}
+
+
+def day9(rng: random.Random, size: int, out: TextIO) -> Answers:
+    length = 21
+    part1 = part2 = 0
+
+    for _ in range(size):
+        degree = rng.randint(0, 8)
+        coeffs = [rng.randint(-9, 9) for _ in range(degree + 1)]
+
+        def poly(x: int) -> int:
+            return sum(c * x**i for i, c in enumerate(coeffs))
+
+        out.write(" ".join(str(poly(x)) for x in range(length)) + "\n")
+        part1 += poly(length)
+        part2 += poly(-1)
+
+    return {1: part1, 2: part2}
+
+
+def day10(rng: random.Random, size: int, out: TextIO) -> Answers:
+    """A single loop around a random region of 3x3 blocks.
+
+    Every block starts as a ring of pipes around its centre tile. The region is
+    grown as a random spanning tree of blocks, and each tree edge splices two
+    neighbouring rings into one, which leaves one loop enclosing all the centres.
+    """
+    blocks = max(2, size // 3)
+    side = 3 * blocks
+
+    start_block = (rng.randrange(blocks), rng.randrange(blocks))
+    region = {start_block}
+    tree: list[tuple[tuple[int, int], tuple[int, int]]] = []
+    frontier = [(start_block, nb) for nb in _block_neighbours(start_block, blocks)]
+    target = max(2, int(blocks * blocks * 0.6))
+
+    while frontier and len(region) < target:
+        parent, child = frontier.pop(rng.randrange(len(frontier)))
+        if child in region:
+            continue
+
+        region.add(child)
+        tree.append((parent, child))
+        frontier.extend((child, nb) for nb in _block_neighbours(child, blocks))
+
+    links: dict[tuple[int, int], set[tuple[int, int]]] = {}
+
+    def link(a: tuple[int, int], b: tuple[int, int]) -> None:
+        links.setdefault(a, set()).add(b)
+        links.setdefault(b, set()).add(a)
+
+    def unlink(a: tuple[int, int], b: tuple[int, int]) -> None:
+        links[a].discard(b)
+        links[b].discard(a)
+
+    ring = [(0, 0), (0, 1), (0, 2), (1, 2), (2, 2), (2, 1), (2, 0), (1, 0)]
+    for br, bc in region:
+        tiles = [(3 * br + r, 3 * bc + c) for r, c in ring]
+        for a, b in zip(tiles, tiles[1:] + tiles[:1]):
+            link(a, b)
+
+    for a, b in tree:
+        (ar, ac), (br, bc) = sorted([a, b])
+        top, left = 3 * ar, 3 * ac
+        if ar == br:
+            # Side by side: cut the facing sides open and bridge them
+            unlink((top, left + 2), (top + 1, left + 2))
+            unlink((top, left + 3), (top + 1, left + 3))
+            link((top, left + 2), (top, left + 3))
+            link((top + 1, left + 2), (top + 1, left + 3))
+        else:
+            unlink((top + 2, left), (top + 2, left + 1))
+            unlink((top + 3, left), (top + 3, left + 1))
+            link((top + 2, left), (top + 3, left))
+            link((top + 2, left + 1), (top + 3, left + 1))
+
+    deltas = {"|": "UD", "-": "LR", "L": "UR", "J": "UL", "7": "DL", "F": "DR"}
+    steps = {"U": (-1, 0), "D": (1, 0), "L": (0, -1), "R": (0, 1)}
+    pipes = {frozenset(steps[d] for d in dirs): pipe for pipe, dirs in deltas.items()}
+
+    grid = [rng.choices("|-LJ7F.", k=side) for _ in range(side)]
+    for (r, c), nbs in links.items():
+        grid[r][c] = pipes[frozenset((nr - r, nc - c) for nr, nc in nbs)]
+
+    start = min(links)
+    prev, curr = start, min(links[start])
+    loop = [start]
+    while curr != start:
+        loop.append(curr)
+        prev, curr = curr, next(t for t in links[curr] if t != prev)
+
+    # S must be the only tile its loop neighbours point at, junk next to it is cleared
+    while True:
+        sr, sc = rng.choice(loop)
+        pointing_in = [
+            (sr + dr, sc + dc)
+            for dr, dc in steps.values()
+            if (sr + dr, sc + dc) in links and (sr, sc) in links[(sr + dr, sc + dc)]
+        ]
+        other_loop_nbs = [
+            (sr + dr, sc + dc)
+            for dr, dc in steps.values()
+            if (sr + dr, sc + dc) in links and (sr + dr, sc + dc) not in pointing_in
+        ]
+        if len(pointing_in) == 2 and not any(
+            (sr, sc) in links[nb] for nb in other_loop_nbs
+        ):
+            break
+
+    grid[sr][sc] = "S"
+    for dr, dc in steps.values():
+        nr, nc = sr + dr, sc + dc
+        if 0 <= nr < side and 0 <= nc < side and (nr, nc) not in links:
+            grid[nr][nc] = "."
+
+    # Shoelace for the area, then Pick's theorem for the tiles inside
+    twice_area = abs(
+        sum(r1 * c2 - r2 * c1 for (r1, c1), (r2, c2) in zip(loop, loop[1:] + loop[:1]))
+    )
+    inside = (twice_area - len(loop)) // 2 + 1
+
+    for row in grid:
+        out.write("".join(row) + "\n")
+
+    return {1: len(loop) // 2, 2: inside}
+
+
+def _block_neighbours(block: tuple[int, int], blocks: int) -> list[tuple[int, int]]:
+    r, c = block
+    candidates = ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1))
+    return [(nr, nc) for nr, nc in candidates if 0 <= nr < blocks and 0 <= nc < blocks]
+
+
+def _sum_pairwise_dists(coords: list[int]) -> int:
+    coords = sorted(coords)
+    n = len(coords)
+    return sum((2 * i - n + 1) * x for i, x in enumerate(coords))
+
+
+def day11(rng: random.Random, size: int, out: TextIO) -> Answers:
+    empty_rows = {r for r in range(size) if rng.random() < 0.05}
+    empty_cols = {c for c in range(size) if rng.random() < 0.05}
+
+    galaxies: list[tuple[int, int]] = []
+    for r in range(size):
+        row = ["."] * size
+        if r not in empty_rows:
+            for c in range(size):
+                if c not in empty_cols and rng.random() < 0.02:
+                    row[c] = "#"
+                    galaxies.append((r, c))
+        out.write("".join(row) + "\n")
+
+    rows_with = {r for r, _ in galaxies}
+    cols_with = {c for _, c in galaxies}
+    empty_before_row = _count_before(r not in rows_with for r in range(size))
+    empty_before_col = _count_before(c not in cols_with for c in range(size))
+
+    answers: Answers = {}
+    for part, expand_by in ((1, 1), (2, 999999)):
+        rows = [r + expand_by * empty_before_row[r] for r, _ in galaxies]
+        cols = [c + expand_by * empty_before_col[c] for _, c in galaxies]
+        answers[part] = _sum_pairwise_dists(rows) + _sum_pairwise_dists(cols)
+
+    return answers
+
+
+def _count_before(flags: Iterable[bool]) -> list[int]:
+    """Number of set flags strictly before each index."""
+    total = 0
+    counts: list[int] = []
+    for flag in flags:
+        counts.append(total)
+        total += flag
+
+    return counts
+
+
+def day12(rng: random.Random, size: int, out: TextIO) -> Answers:
+    rows = 100
+    size = max(size, 1)
+
+    for _ in range(rows):
+        springs = ["#" if rng.random() < 0.4 else "." for _ in range(size)]
+        if "#" not in springs:
+            springs[rng.randrange(size)] = "#"
+
+        groups = [len(g) for g in "".join(springs).split(".") if g]
+        record = "".join("?" if rng.random() < 0.5 else ch for ch in springs)
+
+        out.write(f"{record} {','.join(map(str, groups))}\n")
+
+    return {}
+
+
+def _mirror_diffs(rows: list[str], line: int) -> list[int]:
+    """Character differences of each row pair mirrored around `line`."""
+    return [
+        sum(a != b for a, b in zip(rows[line - 1 - i], rows[line + i]))
+        for i in range(min(line, len(rows) - line))
+    ]
+
+
+def _reflections(rows: list[str]) -> tuple[list[int], list[int]]:
+    """Lines with a perfect reflection, and lines the day 13 solver takes as smudged."""
+    perfect: list[int] = []
+    smudged: list[int] = []
+    for line in range(1, len(rows)):
+        diffs = _mirror_diffs(rows, line)
+        if not any(diffs):
+            perfect.append(line)
+        elif max(diffs) == 1:
+            smudged.append(line)
+
+    return perfect, smudged
+
+
+def _transpose(rows: list[str]) -> list[str]:
+    return ["".join(col) for col in zip(*rows)]
+
+
+def day13(rng: random.Random, size: int, out: TextIO) -> Answers:
+    """Patterns with one perfect column mirror and one row mirror off by a smudge.
+
+    Half of the patterns are transposed so both kinds show up on both axes.
+    """
+    part1 = part2 = 0
+
+    for pattern_idx in range(size):
+        while True:
+            height, width = rng.randint(5, 17), rng.randint(5, 17)
+            row_line = rng.randint(1, height - 1)
+            col_line = rng.choice([c for c in range(1, width) if 2 * c != width])
+
+            grid = [rng.choices("#.", k=width) for _ in range(height)]
+            for i in range(min(row_line, height - row_line)):
+                grid[row_line + i] = grid[row_line - 1 - i][:]
+            for row in grid:
+                for j in range(min(col_line, width - col_line)):
+                    row[col_line + j] = row[col_line - 1 - j]
+
+            # Smudge a cell inside the row mirror but outside the column mirror
+            reach = min(col_line, width - col_line)
+            free_cols = [
+                c for c in range(width) if not col_line - reach <= c < col_line + reach
+            ]
+            r = rng.randrange(row_line - min(row_line, height - row_line), row_line)
+            c = rng.choice(free_cols)
+            grid[r][c] = "#" if grid[r][c] == "." else "."
+
+            rows = ["".join(row) for row in grid]
+            row_perfect, row_smudged = _reflections(rows)
+            col_perfect, col_smudged = _reflections(_transpose(rows))
+            if (row_perfect, row_smudged, col_perfect, col_smudged) == (
+                [],
+                [row_line],
+                [col_line],
+                [],
+            ):
+                break
+
+        if rng.random() < 0.5:
+            rows = _transpose(rows)
+            part1 += 100 * col_line
+            part2 += row_line
+        else:
+            part1 += col_line
+            part2 += 100 * row_line
+
+        if pattern_idx:
+            out.write("\n")
+        out.write("\n".join(rows) + "\n")
+
+    return {1: part1, 2: part2}
+
+
+def day14(rng: random.Random, size: int, out: TextIO) -> Answers:
+    for _ in range(size):
+        out.write("".join(rng.choices("O#.", weights=(20, 15, 65), k=size)) + "\n")
+
+    return {}
+
+
+def hash_step(step: str) -> int:
+    res = 0
+    for ch in step:
+        res = (res + ord(ch)) * 17 % 256
+
+    return res
+
+
+def day15(rng: random.Random, size: int, out: TextIO) -> Answers:
+    labels = [
+        "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(2, 6)))
+        for _ in range(max(10, size // 10))
+    ]
+
+    # Dicts keep insertion order and keep a replaced key in place, just like a box
+    boxes: list[dict[str, int]] = [{} for _ in range(256)]
+    part1 = 0
+
+    steps: list[str] = []
+    for _ in range(size):
+        label = rng.choice(labels)
+        box = boxes[hash_step(label)]
+
+        if rng.random() < 0.7:
+            focal = rng.randint(1, 9)
+            step = f"{label}={focal}"
+            box[label] = focal
+        else:
+            step = f"{label}-"
+            box.pop(label, None)
+
+        part1 += hash_step(step)
+        steps.append(step)
+
+    out.write(",".join(steps) + "\n")
+
+    part2 = sum(
+        (box_idx + 1) * slot * focal
+        for box_idx, box in enumerate(boxes)
+        for slot, focal in enumerate(box.values(), start=1)
+    )
+
+    return {1: part1, 2: part2}
+
+
+def day16(rng: random.Random, size: int, out: TextIO) -> Answers:
+    for _ in range(size):
+        out.write(
+            "".join(rng.choices(".\\/|-", weights=(90, 2.5, 2.5, 2.5, 2.5), k=size))
+            + "\n"
+        )
+
+    return {}
+
+
+GENERATORS: dict[int, Generator] = {
+    1: day1,
+    2: day2,
+    6: day6,
+    7: day7,
+    8: day8,
+    9: day9,
+    10: day10,
+    11: day11,
+    12: day12,
+    13: day13,
+    14: day14,
+    15: day15,
+    16: day16,
+}
+
+
+def generate(day: int, size: int, seed: int, path: Path) -> Answers:
+    rng = random.Random(seed)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as out:
+        return GENERATORS[day](rng, size, out)
@@ -0,0 +1,160 @@
+"""A rectangular grid of single-byte cells, stored in one flat bytearray."""
+
+from typing import Iterable, Iterator
+
+from aoc.io import GridView
+
+
+class Grid:
+    """A rows x cols grid, one byte per cell, e.g. `grid[row, col] == ord("#")`.
+
+    Cell (row, col) lives at `data[grid.index(row, col)]`. Transposed and rotated
+    grids are views: they share `data` with the grid they came from and only map
+    (row, col) to a different flat index, so writes through a view show up in the
+    original. Whole rows and columns are read and written as extended slices of
+    `data`, which keeps the per-cell work out of Python.
+    """
+
+    __slots__ = ("data", "rows", "cols", "offset", "row_step", "col_step")
+
+    def __init__(
+        self,
+        data: bytearray,
+        rows: int,
+        cols: int,
+        offset: int = 0,
+        row_step: int | None = None,
+        col_step: int = 1,
+    ) -> None:
+        self.data = data
+        self.rows = rows
+        self.cols = cols
+        self.offset = offset
+        self.row_step = cols if row_step is None else row_step
+        self.col_step = col_step
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str | bytes], pad: bytes = b"") -> "Grid":
+        """Build a grid from equally long lines.
+
+        A one-byte `pad` surrounds the grid with a border of sentinel cells, so
+        walks can stop on the sentinel instead of checking bounds. Row and column
+        indexes then include the border.
+        """
+        rows = [
+            line.encode() if isinstance(line, str) else bytes(line) for line in lines
+        ]
+        cols = len(rows[0]) if rows else 0
+
+        if pad:
+            rows = [
+                pad * (cols + 2),
+                *(pad + row + pad for row in rows),
+                pad * (cols + 2),
+            ]
+            cols += 2
+
+        return cls(bytearray(b"".join(rows)), len(rows), cols)
+
+    @classmethod
+    def from_buffer(cls, data: memoryview, pad: bytes = b"") -> "Grid":
+        """Build a grid from the raw bytes of an input, see `InputFile.buffer`.
+
+        Without a `pad` the bytes are copied once as they are, line terminators
+        included, and rows are `GridView.stride` apart, so no line is ever split
+        out. With a `pad` the rows are copied out of the buffer like `from_lines`.
+        """
+        view = GridView(data)
+        if pad:
+            return cls.from_lines((view.row(row) for row in range(view.rows)), pad)
+
+        return cls(bytearray(data), view.rows, view.cols, row_step=view.stride)
+
+    def __getitem__(self, pos: tuple[int, int]) -> int:
+        row, col = pos
+        return self.data[self.offset + row * self.row_step + col * self.col_step]
+
+    def __setitem__(self, pos: tuple[int, int], value: int) -> None:
+        row, col = pos
+        self.data[self.offset + row * self.row_step + col * self.col_step] = value
+
+    def __iter__(self) -> Iterator[bytes]:
+        for row in range(self.rows):
+            yield self.row(row)
+
+    def __bytes__(self) -> bytes:
+        return b"".join(self)
+
+    def __str__(self) -> str:
+        return "\n".join(row.decode() for row in self)
+
+    def index(self, row: int, col: int) -> int:
+        return self.offset + row * self.row_step + col * self.col_step
+
+    def pos(self, idx: int) -> tuple[int, int]:
+        """The (row, col) of a flat index, the inverse of `index`."""
+        # One step is ±1 and the other ±width of the underlying data
+        rows_major = abs(self.row_step) > abs(self.col_step) or self.cols == 1
+        if rows_major:
+            big, small, small_len = self.row_step, self.col_step, self.cols
+        else:
+            big, small, small_len = self.col_step, self.row_step, self.rows
+
+        d = idx - self.offset
+        if small < 0:
+            d += small_len - 1
+
+        big_idx, small_idx = divmod(d, abs(big))
+        if big < 0:
+            big_idx = -big_idx
+        if small < 0:
+            small_idx = small_len - 1 - small_idx
+
+        if rows_major:
+            return big_idx, small_idx
+        return small_idx, big_idx
+
+    @property
+    def offsets(self) -> tuple[int, int, int, int]:
+        """Flat index deltas to the north, east, south and west neighbours."""
+        return -self.row_step, self.col_step, self.row_step, -self.col_step
+
+    def _line(self, start: int, step: int, length: int) -> slice:
+        stop = start + step * length
+        return slice(start, stop if stop >= 0 else None, step)
+
+    def row(self, row: int) -> bytes:
+        return bytes(
+            self.data[self._line(self.index(row, 0), self.col_step, self.cols)]
+        )
+
+    def set_row(self, row: int, values: bytes) -> None:
+        self.data[self._line(self.index(row, 0), self.col_step, self.cols)] = values
+
+    def col(self, col: int) -> bytes:
+        return bytes(
+            self.data[self._line(self.index(0, col), self.row_step, self.rows)]
+        )
+
+    def set_col(self, col: int, values: bytes) -> None:
+        self.data[self._line(self.index(0, col), self.row_step, self.rows)] = values
+
+    def transpose(self) -> "Grid":
+        return Grid(
+            self.data, self.cols, self.rows, self.offset, self.col_step, self.row_step
+        )
+
+    def rotate(self) -> "Grid":
+        """A view of the grid turned 90 degrees clockwise."""
+        return Grid(
+            self.data,
+            self.cols,
+            self.rows,
+            self.offset + (self.rows - 1) * self.row_step,
+            self.col_step,
+            -self.row_step,
+        )
+
+    def copy(self) -> "Grid":
+        """A compact row-major copy, no longer sharing data with this grid."""
+        return Grid(bytearray(bytes(self)), self.rows, self.cols)
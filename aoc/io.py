@@ -0,0 +1,206 @@
+import mmap
+import os
+import stat
+import sys
+from pathlib import Path
+from typing import Iterator
+
+INPUT_NAMES = ("example", "full")
+STDIN = "-"
+
+
+def get_args() -> tuple[int, str]:
+    if len(sys.argv) != 3:
+        print("Usage: python main.py <1 or 2> <example, full, file path or ->")
+        sys.exit(1)
+
+    part = int(sys.argv[1])
+    if part not in (1, 2):
+        print("First argument must be either 1 or 2")
+        sys.exit(1)
+
+    mode = sys.argv[2]
+
+    return part, mode
+
+
+def input_path(solver_file: str | Path, name: str) -> Path | None:
+    """Resolve an input name for a solver file, None means stdin.
+
+    Solvers live in `dayN/python/main.py` and named inputs in `dayN/input/<name>`.
+    Any other name is taken as a path to an input file, and `-` reads stdin.
+    """
+    if name == STDIN:
+        return None
+
+    named = Path(solver_file).resolve().parent.parent / "input" / name
+    if not named.exists() and (os.sep in name or Path(name).exists()):
+        return Path(name)
+
+    return named
+
+
+def _stdin_is_file() -> bool:
+    return stat.S_ISREG(os.fstat(sys.stdin.fileno()).st_mode)
+
+
+class GridView:
+    """A rows x cols view of a rectangular text grid, without copying the buffer.
+
+    `data` must cover a whole `bytes`, `bytearray` or `mmap` object. Cells are
+    byte values, e.g. `grid[row, col] == ord("#")`.
+    """
+
+    def __init__(self, data: memoryview) -> None:
+        width = data.obj.find(b"\n")
+        if width == -1:
+            width = len(data)
+
+        self.data = data
+        self.cols = width - 1 if width and data[width - 1] == ord("\r") else width
+        self.stride = width + 1
+        self.rows = (len(data) + 1) // self.stride if width else 0
+
+    def __getitem__(self, pos: tuple[int, int]) -> int:
+        row, col = pos
+        return self.data[row * self.stride + col]
+
+    def index(self, row: int, col: int) -> int:
+        return row * self.stride + col
+
+    def row(self, row: int) -> memoryview:
+        start = row * self.stride
+        return self.data[start : start + self.cols]
+
+    def find(self, ch: bytes) -> tuple[int, int]:
+        """Position of the first cell holding `ch`, or (-1, -1)."""
+        idx = self.data.obj.find(ch)
+        if idx == -1:
+            return -1, -1
+
+        return divmod(idx, self.stride)
+
+
+class InputFile:
+    """A puzzle input, iterable as text lines or readable as raw bytes.
+
+    Iterating yields `str` lines with trailing whitespace removed, like the
+    per-day `read_input` generators used to. `buffer`, `lines_bytes` and `grid`
+    memory-map the file instead, so big inputs can be scanned without creating
+    a string per line.
+
+    A `path` of None reads stdin. Lines are then streamed as they arrive and can
+    only be iterated once; `buffer` has to read a piped stdin into memory first,
+    after which iterating decodes the buffered lines one at a time instead.
+    """
+
+    def __init__(self, path: Path | None) -> None:
+        self.path = path
+        self._buffer: memoryview | None = None
+
+    def __iter__(self) -> Iterator[str]:
+        if self.path is None:
+            if self._buffer is not None:
+                # A piped stdin read into the buffer cannot be read again
+                for line in self.lines_bytes():
+                    yield bytes(line).decode().rstrip()
+                return
+
+            for line in sys.stdin:
+                yield line.rstrip()
+            return
+
+        with open(self.path, "r") as f:
+            for line in f:
+                yield line.rstrip()
+
+    @property
+    def buffer(self) -> memoryview:
+        """The whole input as a read-only memoryview, over an mmap where possible."""
+        if self._buffer is None:
+            if self.path is None:
+                self._buffer = self._map_stdin()
+            else:
+                with open(self.path, "rb") as f:
+                    self._buffer = self._map(f.fileno())
+
+        return self._buffer
+
+    @staticmethod
+    def _map(fileno: int) -> memoryview:
+        try:
+            return memoryview(mmap.mmap(fileno, 0, access=mmap.ACCESS_READ))
+        except ValueError:
+            # Empty files cannot be mapped
+            return memoryview(b"")
+
+    def _map_stdin(self) -> memoryview:
+        if _stdin_is_file():
+            return self._map(sys.stdin.fileno())
+
+        return memoryview(sys.stdin.buffer.read())
+
+    def lines_bytes(
+        self, start: int = 0, stop: int | None = None
+    ) -> Iterator[memoryview]:
+        """Zero-copy views of every line, without the line terminator.
+
+        `start` and `stop` limit the lines to a byte range of the buffer, as
+        returned by `line_ranges`. A piped stdin read as a whole is streamed
+        instead, one line (and one copy) at a time.
+        """
+        whole = start == 0 and stop is None
+        if (
+            whole
+            and self.path is None
+            and self._buffer is None
+            and not _stdin_is_file()
+        ):
+            for line in sys.stdin.buffer:
+                yield memoryview(line.rstrip(b"\r\n"))
+            return
+
+        data = self.buffer
+        obj = data.obj
+        end = len(data) if stop is None else stop
+
+        pos = start
+        while pos < end:
+            nl = obj.find(b"\n", pos, end)
+            if nl == -1:
+                nl = end
+
+            line_end = nl - 1 if nl > pos and data[nl - 1] == ord("\r") else nl
+            yield data[pos:line_end]
+            pos = nl + 1
+
+    def line_ranges(
+        self, size: int, start: int = 0, stop: int | None = None
+    ) -> Iterator[tuple[int, int]]:
+        """Split the buffer into (start, stop) byte ranges of about `size` bytes.
+
+        Every range but the last ends just after a newline, so no line is split
+        and the ranges can be processed independently. `start` and `stop` limit
+        the split to a range that is already aligned to lines.
+        """
+        data = self.buffer
+        end = len(data) if stop is None else stop
+
+        pos = start
+        while pos < end:
+            range_end = pos + size
+            if range_end < end:
+                nl = data.obj.find(b"\n", range_end - 1, end)
+                range_end = end if nl == -1 else nl + 1
+            else:
+                range_end = end
+
+            yield pos, range_end
+            pos = range_end
+
+    def grid(self) -> GridView:
+        return GridView(self.buffer)
+
+
+def read_input(solver_file: str | Path, name: str) -> InputFile:
+    return InputFile(input_path(solver_file, name))
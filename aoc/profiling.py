@@ -0,0 +1,279 @@
+"""Named phase timing for the solvers, with optional cProfile/tracemalloc per phase.
+
+Solvers only mark their phases:
+
+    with phase("parse"):
+        ...
+
+Nothing is measured unless profiling is enabled, either through `configure()`
+(used by `python -m aoc run --profile`) or the environment:
+
+    AOC_PROFILE=1                   time every phase
+    AOC_PROFILE_CPROFILE=solve      run these phases under cProfile ("*" for all)
+    AOC_PROFILE_TRACEMALLOC=parse   trace allocations of these phases ("*" for all)
+    AOC_PROFILE_DIR=profiles        where the per-run reports are written
+"""
+
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, NamedTuple
+
+# Every solver imports this module, so it stays cheap to import: no dataclasses
+# (they pull in inspect) and the profilers are only loaded once a phase uses them
+if TYPE_CHECKING:
+    import cProfile
+    import tracemalloc
+
+DEFAULT_DIR = Path(__file__).resolve().parent.parent / "profiles"
+
+_NULL_PHASE = nullcontext()
+
+
+def _parse_phases(value: str) -> frozenset[str]:
+    return frozenset(name.strip() for name in value.split(",") if name.strip())
+
+
+class Settings(NamedTuple):
+    enabled: bool = False
+    cprofile: frozenset[str] = frozenset()
+    tracemalloc: frozenset[str] = frozenset()
+    out_dir: Path = DEFAULT_DIR
+    top_n: int = 10
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        cprofile = _parse_phases(os.environ.get("AOC_PROFILE_CPROFILE", ""))
+        traced = _parse_phases(os.environ.get("AOC_PROFILE_TRACEMALLOC", ""))
+        enabled = os.environ.get("AOC_PROFILE", "") not in ("", "0")
+
+        return cls(
+            enabled=enabled or bool(cprofile) or bool(traced),
+            cprofile=cprofile,
+            tracemalloc=traced,
+            out_dir=Path(os.environ.get("AOC_PROFILE_DIR", DEFAULT_DIR)),
+        )
+
+    def wants_cprofile(self, name: str) -> bool:
+        return name in self.cprofile or "*" in self.cprofile
+
+    def wants_tracemalloc(self, name: str) -> bool:
+        return name in self.tracemalloc or "*" in self.tracemalloc
+
+
+_settings = Settings.from_env()
+
+
+def configure(**changes) -> Settings:
+    """Override the environment settings, e.g. `configure(enabled=True)`."""
+    global _settings
+    _settings = _settings._replace(**changes)
+    return _settings
+
+
+def is_enabled() -> bool:
+    return _settings.enabled
+
+
+class PhaseAllocs:
+    """Allocations of one phase, summed over every time the phase was entered.
+
+    Each entry adds the memory that was allocated during it and still lived when
+    it ended, per source line, so allocations made between entries (by other
+    phases or the solver itself) never count. `peak` is the highest traced
+    memory reached within a single entry.
+    """
+
+    def __init__(self) -> None:
+        self.sizes: dict[str, int] = {}
+        self.counts: dict[str, int] = {}
+        self.peak = 0
+
+    def add(
+        self,
+        snapshot: "tracemalloc.Snapshot",
+        base: "tracemalloc.Snapshot | None" = None,
+    ) -> None:
+        """Count a snapshot taken at the end of an entry.
+
+        Without a `base` the snapshot only holds what the entry traced; with one
+        (when something else was already tracing) only the difference counts.
+        """
+        if base is None:
+            changes = [
+                (str(stat.traceback), stat.size, stat.count)
+                for stat in snapshot.statistics("lineno")
+            ]
+        else:
+            changes = [
+                (str(stat.traceback), stat.size_diff, stat.count_diff)
+                for stat in snapshot.compare_to(base, "lineno")
+            ]
+
+        for line, size, count in changes:
+            self.sizes[line] = self.sizes.get(line, 0) + size
+            self.counts[line] = self.counts.get(line, 0) + count
+
+    def top(self, n: int) -> list[tuple[str, int, int]]:
+        """The `n` source lines that allocated the most, as (line, size, count)."""
+        lines = sorted(self.sizes, key=lambda line: self.sizes[line], reverse=True)
+        return [(line, self.sizes[line], self.counts[line]) for line in lines[:n]]
+
+
+class ProfileRun:
+    def __init__(self, label: str, settings: Settings) -> None:
+        self.label = label
+        self.settings = settings
+        self.phases: dict[str, float] = {}
+        self.profiles: dict[str, "cProfile.Profile"] = {}
+        self.allocs: dict[str, PhaseAllocs] = {}
+
+    def write_report(self) -> list[Path]:
+        import json
+
+        out_dir = self.settings.out_dir
+        out_dir.mkdir(parents=True, exist_ok=True)
+        stem = self.label.replace("/", "-")
+        written: list[Path] = []
+
+        summary = out_dir / f"{stem}.json"
+        with open(summary, "w") as f:
+            json.dump({"label": self.label, "phases": self.phases}, f, indent=2)
+        written.append(summary)
+
+        for name, profile in self.profiles.items():
+            pstats_file = out_dir / f"{stem}.{name}.pstats"
+            profile.dump_stats(pstats_file)
+            written.append(pstats_file)
+
+        for name, allocs in self.allocs.items():
+            alloc_file = out_dir / f"{stem}.{name}.alloc.txt"
+            with open(alloc_file, "w") as f:
+                f.write(f"peak: {allocs.peak} bytes\n")
+                for line, size, count in allocs.top(self.settings.top_n):
+                    f.write(f"{line}: size={size} B, count={count}\n")
+            written.append(alloc_file)
+
+        return written
+
+
+_current: ProfileRun | None = None
+
+
+def _take_snapshot() -> "tracemalloc.Snapshot":
+    """A snapshot without what the profiling itself allocated."""
+    import tracemalloc
+
+    return tracemalloc.take_snapshot().filter_traces(
+        [
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ]
+    )
+
+
+class _Phase:
+    def __init__(self, run: ProfileRun, name: str) -> None:
+        self.run = run
+        self.name = name
+        self.start = 0.0
+        self.traced = False
+        self.owns_tracing = False
+        self.base: "tracemalloc.Snapshot | None" = None
+        self.traced_start = 0
+
+    def __enter__(self) -> None:
+        settings = self.run.settings
+
+        if settings.wants_tracemalloc(self.name):
+            import tracemalloc
+
+            self.run.allocs.setdefault(self.name, PhaseAllocs())
+            self.traced = True
+
+            # Tracing only while the phase runs keeps the snapshot at its end
+            # small, even for phases entered once per item by phase_iter. Only
+            # when something else is tracing already does it need a full
+            # snapshot to diff against.
+            if tracemalloc.is_tracing():
+                self.base = _take_snapshot()
+            else:
+                tracemalloc.start()
+                self.owns_tracing = True
+            tracemalloc.reset_peak()
+            self.traced_start = tracemalloc.get_traced_memory()[0]
+
+        if settings.wants_cprofile(self.name):
+            import cProfile
+
+            self.run.profiles.setdefault(self.name, cProfile.Profile()).enable()
+
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = time.perf_counter() - self.start
+        self.run.phases[self.name] = self.run.phases.get(self.name, 0.0) + elapsed
+
+        if self.name in self.run.profiles:
+            self.run.profiles[self.name].disable()
+
+        if self.traced:
+            import tracemalloc
+
+            allocs = self.run.allocs[self.name]
+            peak = tracemalloc.get_traced_memory()[1] - self.traced_start
+            allocs.peak = max(allocs.peak, peak)
+            allocs.add(_take_snapshot(), self.base)
+
+            if self.owns_tracing:
+                tracemalloc.stop()
+
+
+def phase(name: str):
+    """Mark a named phase of a solver, a no-op unless a profiled run is active."""
+    if _current is None:
+        return _NULL_PHASE
+
+    return _Phase(_current, name)
+
+
+def phase_iter[T](name: str, items: Iterable[T]) -> Iterable[T]:
+    """Count the time spent producing each item towards a phase.
+
+    Lets streaming solvers keep parsing lazily, one line at a time, and still
+    report the parse time. Returns `items` untouched unless a run is profiled.
+    """
+    if _current is None:
+        return items
+
+    return _timed_iter(name, iter(items))
+
+
+def _timed_iter[T](name: str, items: Iterator[T]) -> Iterator[T]:
+    while True:
+        with phase(name):
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+        yield item
+
+
+@contextmanager
+def profile_run(label: str) -> Iterator[ProfileRun | None]:
+    """Collect the phases of one solver run and write its report afterwards."""
+    global _current
+
+    if not _settings.enabled:
+        yield None
+        return
+
+    run = ProfileRun(label, _settings)
+    _current = run
+    try:
+        yield run
+    finally:
+        _current = None
+
+    run.write_report()
@@ -0,0 +1,203 @@
+import importlib.util
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from aoc import profiling
+from aoc.io import read_input
+
+if TYPE_CHECKING:
+    from aoc.cache import ResultCache
+
+ROOT = Path(__file__).resolve().parent.parent
+DAY_PATTERN = re.compile(r"day(\d+)")
+
+
+@dataclass(frozen=True)
+class Job:
+    day: int
+    part: int
+    input_name: str
+
+    @property
+    def key(self) -> str:
+        return f"day{self.day}/part{self.part}/{self.input_name}"
+
+
+@dataclass(frozen=True)
+class Result:
+    job: Job
+    answer: int | None
+    seconds: float
+    error: str | None = None
+    phases: dict[str, float] = field(default_factory=dict)
+    cached: bool = False
+    # CPU time of the job's own process, unlike `seconds` it does not grow while
+    # parallel jobs wait for a CPU
+    cpu_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def discover_days(root: Path = ROOT) -> dict[int, Path]:
+    """Map each day number to its Python solver, e.g. {1: .../day1/python/main.py}."""
+    days: dict[int, Path] = {}
+    for solver_file in root.glob("day*/python/main.py"):
+        if match := DAY_PATTERN.fullmatch(solver_file.parent.parent.name):
+            days[int(match.group(1))] = solver_file
+
+    return dict(sorted(days.items()))
+
+
+_loaded: dict[int, ModuleType] = {}
+
+
+def load_solver(day: int, root: Path = ROOT) -> ModuleType:
+    """Import a day's solver module once and keep it for the rest of the process."""
+    if day in _loaded:
+        return _loaded[day]
+
+    solver_file = discover_days(root)[day]
+    spec = importlib.util.spec_from_file_location(f"aoc_day{day}", solver_file)
+    assert spec is not None and spec.loader is not None
+
+    module = importlib.util.module_from_spec(spec)
+    # Registered so functions of the solver can be pickled, e.g. for a process pool
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+
+    _loaded[day] = module
+    return module
+
+
+def make_jobs(
+    days: Iterable[int], parts: Iterable[int], input_names: Iterable[str]
+) -> list[Job]:
+    parts = tuple(parts)
+    input_names = tuple(input_names)
+    return [
+        Job(day, part, name) for day in days for name in input_names for part in parts
+    ]
+
+
+def solve_job(job: Job) -> int:
+    solver = load_solver(job.day)
+    return solver.solve(job.part, read_input(solver.__file__, job.input_name))
+
+
+def cache_get(cache: "ResultCache | None", job: Job) -> int | None:
+    """A cached answer, None on a miss or when the cache cannot be read."""
+    if cache is None:
+        return None
+
+    try:
+        return cache.get(job)
+    except (OSError, KeyError):
+        return None
+
+
+def cache_put(cache: "ResultCache | None", job: Job, answer: int) -> None:
+    """Store an answer, warning instead of failing when the cache is unwritable."""
+    if cache is None:
+        return
+
+    try:
+        cache.put(job, answer)
+    except OSError as e:
+        print(f"warning: could not cache {job.key}: {e}", file=sys.stderr)
+
+
+def run_job(job: Job, cache: "ResultCache | None" = None) -> Result:
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        load_solver(job.day)
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+
+        if (answer := cache_get(cache, job)) is not None:
+            return Result(
+                job,
+                answer,
+                time.perf_counter() - start,
+                cached=True,
+                cpu_seconds=time.process_time() - cpu_start,
+            )
+
+        with profiling.profile_run(job.key) as prof:
+            answer = solve_job(job)
+    except Exception as e:
+        return Result(
+            job,
+            None,
+            time.perf_counter() - start,
+            f"{type(e).__name__}: {e}",
+            cpu_seconds=time.process_time() - cpu_start,
+        )
+
+    elapsed = time.perf_counter() - start
+    cpu_elapsed = time.process_time() - cpu_start
+    cache_put(cache, job, answer)
+
+    phases = prof.phases if prof is not None else {}
+    return Result(job, answer, elapsed, phases=phases, cpu_seconds=cpu_elapsed)
+
+
+def run(jobs: Iterable[Job], cache: "ResultCache | None" = None) -> list[Result]:
+    return [run_job(job, cache) for job in jobs]
+
+
+def schedule_longest_first(
+    jobs: Iterable[Job], expected: dict[str, float]
+) -> list[Job]:
+    """Order jobs by their expected runtime, jobs without any history go first."""
+    return sorted(jobs, key=lambda job: expected.get(job.key, math.inf), reverse=True)
+
+
+def run_parallel(
+    jobs: Iterable[Job],
+    workers: int | None = None,
+    cache: "ResultCache | None" = None,
+    expected: dict[str, float] | None = None,
+) -> Iterator[Result]:
+    """Run jobs in a process pool and yield the results as they finish.
+
+    `expected` maps job keys to their runtime from an earlier benchmark, so the
+    longest jobs are started first and the short ones fill in around them.
+    """
+    pending: list[Job] = []
+    for job in schedule_longest_first(jobs, expected or {}):
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        if (answer := cache_get(cache, job)) is not None:
+            yield Result(
+                job,
+                answer,
+                time.perf_counter() - start,
+                cached=True,
+                cpu_seconds=time.process_time() - cpu_start,
+            )
+        else:
+            pending.append(job)
+
+    if not pending:
+        return
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = [pool.submit(run_job, job) for job in pending]
+
+        for future in as_completed(futures):
+            result = future.result()
+            if result.ok:
+                cache_put(cache, result.job, result.answer)
+
+            yield result
@@ -1,8 +1,21 @@
+import functools as ft
+import os
 import sys
-from typing import Callable, Iterator
+from collections import deque
+from pathlib import Path
+from typing import Iterable
 
-strCompFn = Callable[[str, str], bool]
-strShortenFn = Callable[[str], str]
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.io import InputFile, get_args, read_input  # noqa: E402
+from aoc.profiling import phase  # noqa: E402
+
+# Below this size the per-line loop is done before numpy would even be imported
+BATCH_MIN_BYTES = 2**20
+# Bytes per numpy pass, keeps the temporary arrays to a few hundred MiB
+BATCH_CHUNK_BYTES = 2**26
+# Inputs this big are split over a pool of worker processes, one per CPU
+PARALLEL_MIN_BYTES = 2**26
 
 
 def create_two_digit_num(*nums: int):
@@ -35,64 +48,199 @@ char_dict = {
 }
 
 
-def extract_num(line: str, str_compare: strCompFn, str_shorten: strShortenFn) -> int:
-    while line:
-        for k, v in char_dict.items():
-            if str_compare(line, k):
-                return v
+class DigitScanner:
+    """Aho-Corasick automaton that finds the first of several patterns in a line.
 
-        for k, v in str_dict.items():
-            if str_compare(line, k):
-                return v
+    The automaton is compiled into a dense table of 256 transitions per state, so
+    a line is scanned once, one table lookup per byte, however many patterns
+    there are. A pattern starting inside another one (the "two" in "eightwo")
+    is still found.
+    """
 
-        line = str_shorten(line)
+    def __init__(self, patterns: dict[bytes, int]) -> None:
+        # Trie of the patterns, `found` is the value of the pattern ending in a state
+        goto: list[dict[int, int]] = [{}]
+        found = [-1]
+        for pattern, value in patterns.items():
+            state = 0
+            for byte in pattern:
+                if byte not in goto[state]:
+                    goto[state][byte] = len(goto)
+                    goto.append({})
+                    found.append(-1)
+                state = goto[state][byte]
+            found[state] = value
 
-    raise RuntimeError(f"no number could be extracted from {line}")
+        # Breadth first, so the fallback of a state is complete before it is used
+        table = [0] * (256 * len(goto))
+        fallback = [0] * len(goto)
+        queue: deque[int] = deque()
 
+        for byte, child in goto[0].items():
+            table[byte] = child
+            queue.append(child)
 
-def get_args() -> tuple[int, str]:
-    if len(sys.argv) != 3:
-        print("Usage: python main.py <1 or 2> <example or full>")
-        sys.exit(1)
+        while queue:
+            state = queue.popleft()
+            if found[state] == -1:
+                found[state] = found[fallback[state]]
 
-    part = int(sys.argv[1])
-    if part not in (1, 2):
-        print("First argument must be either 1 or 2")
-        sys.exit(1)
+            for byte in range(256):
+                if (child := goto[state].get(byte)) is not None:
+                    fallback[child] = table[fallback[state] << 8 | byte]
+                    table[state << 8 | byte] = child
+                    queue.append(child)
+                else:
+                    table[state << 8 | byte] = table[fallback[state] << 8 | byte]
 
-    mode = sys.argv[2]
-    if mode not in ("example", "full"):
-        print("Second argument must be either example or full")
-        sys.exit(1)
+        self.table = table
+        self.found = found
 
-    return part, mode
+    def scan(self, line: Iterable[int]) -> int:
+        """Value of the first pattern that ends in `line`, -1 if there is none."""
+        table, found = self.table, self.found
 
+        state = 0
+        for byte in line:
+            state = table[state << 8 | byte]
+            if found[state] != -1:
+                return found[state]
 
-def read_input(name: str) -> Iterator[str]:
-    with open(f"../input/{name}", "r") as f:
-        for line in f:
-            yield line.rstrip()
+        return -1
 
 
-def main():
-    part, mode = get_args()
+@ft.cache
+def digit_scanners() -> tuple[DigitScanner, DigitScanner]:
+    """Scanners for the first digit of a line, and the first of the reversed line."""
+    patterns = {k.encode(): v for k, v in (char_dict | str_dict).items()}
+
+    first = DigitScanner(patterns)
+    last = DigitScanner({k[::-1]: v for k, v in patterns.items()})
+
+    return first, last
+
+
+def extract_num(line: memoryview, scanner: DigitScanner) -> int:
+    num = scanner.scan(line)
+    if num == -1:
+        raise RuntimeError(f"no number could be extracted from {bytes(line)!r}")
+
+    return num
+
+
+def calibration_sum_batch(
+    inp: InputFile, start: int = 0, stop: int | None = None
+) -> int:
+    """Part 1 for a whole buffer, with array operations instead of a loop per line.
+
+    The first digit of a line is the first digit position at or after its start,
+    the last one the last digit position before its end, both found with a
+    binary search over the sorted positions of all digits.
+    """
+    import numpy as np
+
+    data = inp.buffer
+
+    total = 0
+    for chunk_start, chunk_stop in inp.line_ranges(BATCH_CHUNK_BYTES, start, stop):
+        chunk = np.frombuffer(data[chunk_start:chunk_stop], dtype=np.uint8)
+
+        line_ends = np.flatnonzero(chunk == ord("\n"))
+        if chunk[-1] != ord("\n"):
+            line_ends = np.append(line_ends, len(chunk))
+        line_starts = np.concatenate(([0], line_ends[:-1] + 1))
+
+        digit_idxs = np.flatnonzero((chunk >= ord("0")) & (chunk <= ord("9")))
+        first = np.searchsorted(digit_idxs, line_starts)
+        last = np.searchsorted(digit_idxs, line_ends) - 1
+
+        if (no_digit := first > last).any():
+            line = chunk_start + int(line_starts[no_digit.argmax()])
+            raise RuntimeError(f"no number could be extracted from line at byte {line}")
+
+        tens = chunk[digit_idxs[first]].astype(np.int64) - ord("0")
+        ones = chunk[digit_idxs[last]].astype(np.int64) - ord("0")
+        total += int((tens * 10 + ones).sum())
+
+    return total
+
+
+def calibration_sum_words(
+    inp: InputFile, start: int = 0, stop: int | None = None
+) -> int:
+    """Part 2 for the lines of a byte range, digits spelled out as words included."""
+    first, last = digit_scanners()
+
+    res = 0
+    for line in inp.lines_bytes(start, stop):
+        first_num = extract_num(line, first)
+        last_num = extract_num(line[::-1], last)
+        res += first_num * 10 + last_num
+
+    return res
+
+
+def solve_range(part: int, path: Path, start: int, stop: int) -> int:
+    """Solve the lines in one byte range of an input file, run in a worker process."""
+    inp = InputFile(path)
 
     if part == 1:
-        res = 0
-        for line in read_input(mode):
-            line_nums = [int(ch) for ch in line if ch.isdigit()]
-            res += line_nums[0] * 10 + line_nums[-1]
+        return calibration_sum_batch(inp, start, stop)
+    return calibration_sum_words(inp, start, stop)
+
 
-        print(res)
+def solve_parallel(part: int, inp: InputFile, workers: int | None = None) -> int:
+    """Split the input into line-aligned byte ranges and sum their answers.
+
+    Each worker maps the file itself, so only the range bounds and the partial
+    sums cross between processes. There are a few ranges per worker, so a slow
+    range does not leave the other workers idle at the end.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    assert inp.path is not None, "workers reopen the input, stdin cannot be split"
+    workers = workers or os.cpu_count() or 1
+    range_size = max(len(inp.buffer) // (workers * 4), 1)
+
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [
+            pool.submit(solve_range, part, inp.path, start, stop)
+            for start, stop in inp.line_ranges(range_size)
+        ]
+        return sum(future.result() for future in futures)
+
+
+def solve(part: int, inp: InputFile) -> int:
+    if part not in (1, 2):
+        raise ValueError(f"Unknown part: {part}")
+
+    if inp.path is not None and (os.cpu_count() or 1) > 1:
+        if len(inp.buffer) >= PARALLEL_MIN_BYTES:
+            with phase("solve"):
+                return solve_parallel(part, inp)
+
+    if part == 1:
+        # Sizing stdin would read all of it, keep streaming it line by line
+        if inp.path is not None and len(inp.buffer) >= BATCH_MIN_BYTES:
+            with phase("solve"):
+                return calibration_sum_batch(inp)
 
-    if part == 2:
         res = 0
-        for line in read_input(mode):
-            first_num = extract_num(line, str.startswith, lambda line: line[1:])
-            last_num = extract_num(line, str.endswith, lambda line: line[:-1])
-            res += first_num * 10 + last_num
+        with phase("solve"):
+            for line in inp:
+                line_nums = [int(ch) for ch in line if ch.isdigit()]
+                res += line_nums[0] * 10 + line_nums[-1]
+
+        return res
+
+    with phase("solve"):
+        return calibration_sum_words(inp)
+
+
+def main():
+    part, mode = get_args()
 
-        print(res)
+    print(solve(part, read_input(__file__, mode)))
 
 
 if __name__ == "__main__":
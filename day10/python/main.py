@@ -1,40 +1,14 @@
 import sys
-from dataclasses import dataclass
 from enum import Enum
 from functools import cached_property
 from pathlib import Path
-from typing import Iterator, Self
+from typing import Self
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-def get_args() -> tuple[int, str]:
-    if len(sys.argv) != 3:
-        print("Usage: python main.py <1 or 2> <example or full>")
-        sys.exit(1)
-
-    part = int(sys.argv[1])
-    if part not in (1, 2):
-        print("First argument must be either 1 or 2")
-        sys.exit(1)
-
-    mode = sys.argv[2]
-    if mode not in ("example", "full"):
-        print("Second argument must be either example or full")
-        sys.exit(1)
-
-    return part, mode
-
-
-def read_input(name: str) -> Iterator[str]:
-    file_path = Path(__file__).parent / ".." / "input" / name
-    with open(file_path, "r") as f:
-        for line in f:
-            yield line.rstrip()
-
-
-@dataclass
-class Tile:
-    ch: str
-    idx: tuple[int, int]
+from aoc.grid import Grid  # noqa: E402
+from aoc.io import InputFile, get_args, read_input  # noqa: E402
+from aoc.profiling import phase  # noqa: E402
 
 
 class Dir(Enum):
@@ -45,39 +19,28 @@ class Dir(Enum):
 
 
 class Maze:
-    def __init__(self, rows: list[list[Tile]], s: Tile) -> None:
-        self.rows = rows
-        self.s = s
+    def __init__(self, grid: Grid, s: int) -> None:
+        self.grid = grid
+        self.s = s  # Flat index of the start tile
 
-    def __getitem__(self, row: int) -> list[Tile]:
-        return self.rows[row]
-
-    def __iter__(self) -> Iterator[list[Tile]]:
-        for row in self.rows:
-            yield row
-
-    def get_tile(self, row: int, col: int) -> Tile:
-        return self[row][col]
+    def ch(self, idx: int) -> str:
+        return chr(self.grid.data[idx])
 
     def print(self):
-        for row in self.rows:
-            print(" ".join(tile.ch for tile in row))
+        print(self.grid)
 
     @cached_property
-    def start_tiles(self) -> list[tuple[Tile, Dir]]:
-        up = self.get_tile(self.s.idx[0] - 1, self.s.idx[1])
-        right = self.get_tile(self.s.idx[0], self.s.idx[1] + 1)
-        down = self.get_tile(self.s.idx[0] + 1, self.s.idx[1])
-        left = self.get_tile(self.s.idx[0], self.s.idx[1] - 1)
-
-        starting_tiles: list[tuple[Tile, Dir]] = []
-        if up.ch in ("|", "7", "F"):
+    def start_tiles(self) -> list[tuple[int, Dir]]:
+        up, right, down, left = (self.s + delta for delta in self.grid.offsets)
+
+        starting_tiles: list[tuple[int, Dir]] = []
+        if self.ch(up) in ("|", "7", "F"):
             starting_tiles.append((up, Dir.DOWN))
-        if right.ch in ("-", "J", "7"):
+        if self.ch(right) in ("-", "J", "7"):
             starting_tiles.append((right, Dir.LEFT))
-        if down.ch in ("|", "J", "L"):
+        if self.ch(down) in ("|", "J", "L"):
             starting_tiles.append((down, Dir.UP))
-        if left.ch in ("-", "L", "F"):
+        if self.ch(left) in ("-", "L", "F"):
             starting_tiles.append((left, Dir.RIGHT))
 
         assert len(starting_tiles) == 2
@@ -85,36 +48,10 @@ class Maze:
         return starting_tiles
 
     @classmethod
-    def create_game_maze(cls, fname: str) -> Self:
-        rows: list[list[Tile]] = []
-        start_idxs = (-1, -1)
-
-        for idx_row, line in enumerate(read_input(fname)):
-            # First line padding
-            if idx_row == 0:
-                padding_line = ["."] * (len(line) + 2)
-                padding_row = [
-                    Tile(ch, (idx_row, idx_col))
-                    for idx_col, ch in enumerate(padding_line)
-                ]
-                rows.append(padding_row)
-
-            # First and last col padding
-            padded_line = "." + line + "."
-
-            row: list[Tile] = []
-            for idx_col, ch in enumerate(padded_line):
-                if ch == "S":
-                    start_idxs = (idx_row + 1, idx_col)
-                row.append(Tile(ch, (idx_row + 1, idx_col)))
-
-            rows.append(row)
-
-        # Last line padding
-        rows.append(rows[0].copy())
-
-        s = rows[start_idxs[0]][start_idxs[1]]
-        return Maze(rows, s)
+    def create_game_maze(cls, data: memoryview) -> Self:
+        # Padding keeps the neighbours of S inside the grid
+        grid = Grid.from_buffer(data, pad=b".")
+        return Maze(grid, grid.data.find(b"S"))
 
 
 class TilePointer:
@@ -127,24 +64,30 @@ class TilePointer:
         "F": ((), (1, 0, Dir.UP), (0, 1, Dir.LEFT), ()),
     }
 
-    def __init__(self, maze: Maze, tile: Tile, dist: int, came_from: Dir) -> None:
+    def __init__(self, maze: Maze, idx: int, dist: int, came_from: Dir) -> None:
         self.maze = maze
-        self.tile = tile
+        self.idx = idx
         self.dist = dist
         self.came_from = came_from
 
     def __repr__(self) -> str:
-        return f"TilePointer({self.tile}, dist={self.dist}, came_from={self.came_from})"
+        return (
+            f"TilePointer({self.ch!r} at {self.maze.grid.pos(self.idx)}, "
+            f"dist={self.dist}, came_from={self.came_from})"
+        )
+
+    @property
+    def ch(self) -> str:
+        return self.maze.ch(self.idx)
 
     def step(self) -> None:
-        next_info = self.dir_map[self.tile.ch][self.came_from.value]
+        next_info = self.dir_map[self.ch][self.came_from.value]
         assert len(next_info) == 3
 
         row_delta, col_delta, new_came_from = next_info
-        new_row_idx = self.tile.idx[0] + row_delta
-        new_col_idx = self.tile.idx[1] + col_delta
+        grid = self.maze.grid
 
-        self.tile = self.maze.get_tile(new_row_idx, new_col_idx)
+        self.idx += row_delta * grid.row_step + col_delta * grid.col_step
         self.dist += 1
         self.came_from = new_came_from
 
@@ -162,45 +105,56 @@ def calculate_area(vertices: list[tuple[int, int]]) -> int:
     return int(area)
 
 
-def main():
-    part, fname = get_args()
-
+def solve(part: int, inp: InputFile) -> int:
     if part == 1:
-        maze = Maze.create_game_maze(fname)
+        with phase("parse"):
+            maze = Maze.create_game_maze(inp.buffer)
 
-        pointers = [TilePointer(maze, tile, 1, dir) for tile, dir in maze.start_tiles]
-        p1 = pointers[0]
-        p2 = pointers[1]
+        with phase("solve"):
+            pointers = [TilePointer(maze, idx, 1, dir) for idx, dir in maze.start_tiles]
+            p1 = pointers[0]
+            p2 = pointers[1]
 
-        max_dist = 0
-        while p1.tile.idx != p2.tile.idx:
-            max_dist = max(max_dist, p1.dist, p2.dist)
-            p1.step()
-            p2.step()
+            max_dist = 0
+            while p1.idx != p2.idx:
+                max_dist = max(max_dist, p1.dist, p2.dist)
+                p1.step()
+                p2.step()
 
-        print("SOLUTION:", max_dist + 1)
+        return max_dist + 1
 
     if part == 2:
-        maze = Maze.create_game_maze(fname)
+        with phase("parse"):
+            maze = Maze.create_game_maze(inp.buffer)
 
-        p = [TilePointer(maze, tile, 1, dir) for tile, dir in maze.start_tiles][0]
+        with phase("solve"):
+            p = [TilePointer(maze, idx, 1, dir) for idx, dir in maze.start_tiles][0]
 
-        num_boundary_pts = 1
-        corner_pts: list[tuple[int, int]] = []
-        corner_pts.append(maze.s.idx)
+            num_boundary_pts = 1
+            corner_pts: list[tuple[int, int]] = []
+            corner_pts.append(maze.grid.pos(maze.s))
 
-        while p.tile.ch != "S":
-            num_boundary_pts += 1
+            while p.ch != "S":
+                num_boundary_pts += 1
 
-            if p.tile.ch in list("FJL7"):
-                corner_pts.append(p.tile.idx)
+                if p.ch in list("FJL7"):
+                    corner_pts.append(maze.grid.pos(p.idx))
 
-            p.step()
+                p.step()
 
-        area = calculate_area(corner_pts)
-        num_inside_pts = int(area + 1 - (num_boundary_pts / 2))
+        with phase("aggregate"):
+            area = calculate_area(corner_pts)
+            num_inside_pts = int(area + 1 - (num_boundary_pts / 2))
+
+        return num_inside_pts
+
+    raise ValueError(f"Unknown part: {part}")
+
+
+def main():
+    part, fname = get_args()
 
-        print("SOLUTION:", num_inside_pts)
+    print("SOLUTION:", solve(part, read_input(__file__, fname)))
 
 
 if __name__ == "__main__":
@@ -2,34 +2,14 @@ import functools as ft
 import re
 import sys
 from pathlib import Path
-from typing import Iterator
+from typing import Iterable
 
-PATTERN = re.compile("(#+)")
-
-
-def get_args() -> tuple[int, str]:
-    if len(sys.argv) != 3:
-        print("Usage: python main.py <1 or 2> <example or full>")
-        sys.exit(1)
-
-    part = int(sys.argv[1])
-    if part not in (1, 2):
-        print("First argument must be either 1 or 2")
-        sys.exit(1)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-    mode = sys.argv[2]
-    if mode not in ("example", "full"):
-        print("Second argument must be either example or full")
-        sys.exit(1)
+from aoc.io import get_args, read_input  # noqa: E402
+from aoc.profiling import phase, phase_iter  # noqa: E402
 
-    return part, mode
-
-
-def read_input(name: str) -> Iterator[str]:
-    file_path = Path(__file__).parent / ".." / "input" / name
-    with open(file_path, "r") as f:
-        for line in f:
-            yield line.rstrip()
+PATTERN = re.compile("(#+)")
 
 
 def parse_input1(line: str) -> tuple[str, tuple[int, ...]]:
@@ -115,32 +95,28 @@ def count_valid_arrangements(symbols: str, nums: tuple[int, ...]) -> int:
             raise RuntimeError("Invalid symbol in input:", symbols[0])
 
 
-def main():
-    part, mode = get_args()
-
+def solve(part: int, lines: Iterable[str]) -> int:
     if part == 1:
-        total = 0
-
-        for line_num, line in enumerate(read_input(mode), start=1):
-            symbols, nums = parse_input1(line)
-
-            line_valid = count_valid_arrangements(symbols, nums)
+        parse_input = parse_input1
+    elif part == 2:
+        parse_input = parse_input2
+    else:
+        raise ValueError(f"Unknown part: {part}")
 
-            total += line_valid
+    records = (parse_input(line) for line in lines)
 
-            print("Processed line:", line_num, "valid:", line_valid)
+    total = 0
+    for symbols, nums in phase_iter("parse", records):
+        with phase("solve"):
+            total += count_valid_arrangements(symbols, nums)
 
-        print(total)
-    if part == 2:
-        total = 0
+    return total
 
-        for line_num, line in enumerate(read_input(mode), start=1):
-            symbols, nums = parse_input2(line)
-            total += count_valid_arrangements(symbols, nums)
 
-            print("Processed line", line_num)
+def main():
+    part, mode = get_args()
 
-        print(total)
+    print(solve(part, read_input(__file__, mode)))
 
 
 if __name__ == "__main__":
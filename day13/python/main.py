@@ -1,81 +1,54 @@
 import sys
 from enum import Enum, auto
 from pathlib import Path
-from typing import Iterable, Iterator
+from typing import Iterable
 
-import more_itertools as mit
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-type Matrix = list[str]
+from aoc.grid import Grid  # noqa: E402
+from aoc.io import get_args, read_input  # noqa: E402
+from aoc.profiling import phase, phase_iter  # noqa: E402
 
-
-def get_args() -> tuple[int, str]:
-    if len(sys.argv) != 3:
-        print("Usage: python main.py <1 or 2> <example or full>")
-        sys.exit(1)
-
-    part = int(sys.argv[1])
-    if part not in (1, 2):
-        print("First argument must be either 1 or 2")
-        sys.exit(1)
-
-    mode = sys.argv[2]
-    if mode not in ("example", "full"):
-        print("Second argument must be either example or full")
-        sys.exit(1)
-
-    return part, mode
-
-
-def read_input(name: str) -> Iterator[str]:
-    file_path = Path(__file__).parent / ".." / "input" / name
-    with open(file_path, "r") as f:
-        for line in f:
-            yield line.rstrip()
+type Matrix = Grid
 
 
 def print_matrix(matrix: Matrix) -> None:
-    for row in matrix:
-        print(row)
-
-
-def transpose_matrix(matrix: Matrix) -> Matrix:
-    return ["".join(col) for col in zip(*matrix)]
+    print(matrix)
 
 
 def rows_pairwise_equal(
     matrix: Matrix, row_idxs1: Iterable[int], row_idxs2: Iterable[int]
 ) -> bool:
     for fst, snd in zip(row_idxs1, row_idxs2):
-        if matrix[fst] != matrix[snd]:
+        if matrix.row(fst) != matrix.row(snd):
             return False
     return True
 
 
 def calc_value_for_matrix(matrix: Matrix, kind: str, num: int) -> int:
-    for i in range(1, len(matrix)):
+    for i in range(1, matrix.rows):
         idxs_lt = list(range(i))
-        idxs_ge = list(range(i, len(matrix)))
+        idxs_ge = list(range(i, matrix.rows))
 
         if rows_pairwise_equal(matrix, reversed(idxs_lt), idxs_ge):
-            print(f"{num=}, {kind=}, {i=}")
             return i
 
     return 0
 
 
 def calc_value_for_matrix_with_replace(matrix: Matrix, kind: str, num: int) -> int:
-    for i in range(1, len(matrix)):
+    for i in range(1, matrix.rows):
         matching_rows = 0
         one_diff_rows = 0
 
         idxs_lt = list(range(i))
-        idxs_ge = list(range(i, len(matrix)))
+        idxs_ge = list(range(i, matrix.rows))
 
         for fst, snd in zip(reversed(idxs_lt), idxs_ge):
-            row1 = matrix[fst]
-            row2 = matrix[snd]
+            row1 = matrix.row(fst)
+            row2 = matrix.row(snd)
             if row1 != row2:
-                diff_idxs = get_diff_idxs_for_strs(matrix[fst], matrix[snd])
+                diff_idxs = get_diff_idxs_for_strs(row1, row2)
                 if len(diff_idxs) == 1:
                     one_diff_rows += 1
             else:
@@ -83,13 +56,12 @@ def calc_value_for_matrix_with_replace(matrix: Matrix, kind: str, num: int) -> i
 
         window_len = min(len(idxs_lt), len(idxs_ge))
         if one_diff_rows > 0 and matching_rows + one_diff_rows == window_len:
-            print(f"{num=}, {kind=}, {i=}")
             return i
 
     return 0
 
 
-def get_diff_idxs_for_strs(s1: str, s2: str) -> list[int]:
+def get_diff_idxs_for_strs(s1: bytes, s2: bytes) -> list[int]:
     diff_idxs: list[int] = []
     for i, (c1, c2) in enumerate(zip(s1, s2)):
         if c1 != c2:
@@ -98,39 +70,48 @@ def get_diff_idxs_for_strs(s1: str, s2: str) -> list[int]:
     return diff_idxs
 
 
-def main():
-    part, mode = get_args()
+def solve(part: int, lines: Iterable[str]) -> int:
+    import more_itertools as mit
 
-    if part == 1:
-        lines = read_input(mode)
-        matrices = list(mit.split_at(lines, lambda line: line.strip() == ""))
+    matrices = (
+        Grid.from_lines(pattern)
+        for pattern in mit.split_at(lines, lambda line: line.strip() == "")
+    )
 
+    if part == 1:
         total = 0
-        for i, matrix in enumerate(matrices):
-            row_idx = calc_value_for_matrix(matrix, kind="row", num=i)
-            col_idx = calc_value_for_matrix(transpose_matrix(matrix), kind="col", num=i)
+        for i, matrix in enumerate(phase_iter("parse", matrices)):
+            with phase("solve"):
+                row_idx = calc_value_for_matrix(matrix, kind="row", num=i)
+                col_idx = calc_value_for_matrix(matrix.transpose(), kind="col", num=i)
 
-            current = (row_idx * 100) + col_idx
-            total += current
+                current = (row_idx * 100) + col_idx
+                total += current
 
-        print("SOLUTION:", total)
+        return total
 
     if part == 2:
-        lines = read_input(mode)
-        matrices = list(mit.split_at(lines, lambda line: line.strip() == ""))
-
         total = 0
-        for i, matrix in enumerate(matrices):
-            col_idx = calc_value_for_matrix_with_replace(
-                transpose_matrix(matrix), kind="col", num=i
-            )
+        for i, matrix in enumerate(phase_iter("parse", matrices)):
+            with phase("solve"):
+                col_idx = calc_value_for_matrix_with_replace(
+                    matrix.transpose(), kind="col", num=i
+                )
+
+                row_idx = calc_value_for_matrix_with_replace(matrix, kind="row", num=i)
+
+                current = (row_idx * 100) + col_idx
+                total += current
 
-            row_idx = calc_value_for_matrix_with_replace(matrix, kind="row", num=i)
+        return total
 
-            current = (row_idx * 100) + col_idx
-            total += current
+    raise ValueError(f"Unknown part: {part}")
+
+
+def main():
+    part, mode = get_args()
 
-        print("SOLUTION:", total)
+    print("SOLUTION:", solve(part, read_input(__file__, mode)))
 
 
 if __name__ == "__main__":
@@ -1,154 +1,94 @@
 import sys
 from pathlib import Path
-from typing import Iterator
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-def get_args() -> tuple[int, str]:
-    if len(sys.argv) != 3:
-        print("Usage: python main.py <1 or 2> <example or full>")
-        sys.exit(1)
+from aoc.grid import Grid  # noqa: E402
+from aoc.io import InputFile, get_args, read_input  # noqa: E402
+from aoc.profiling import phase  # noqa: E402
 
-    part = int(sys.argv[1])
-    if part not in (1, 2):
-        print("First argument must be either 1 or 2")
-        sys.exit(1)
 
-    mode = sys.argv[2]
-    if mode not in ("example", "full"):
-        print("Second argument must be either example or full")
-        sys.exit(1)
+def tilt_north(grid: Grid) -> None:
+    """Roll every round rock north until it hits a cube rock or the edge, in place."""
+    for col in range(grid.cols):
+        # Between two '#'s all 'O's end up packed at the northern end
+        segments = grid.col(col).split(b"#")
+        grid.set_col(
+            col,
+            b"#".join(
+                b"O" * (n := seg.count(b"O")) + b"." * (len(seg) - n)
+                for seg in segments
+            ),
+        )
 
-    return part, mode
 
-
-def read_input(name: str) -> Iterator[str]:
-    file_path = Path(__file__).parent / ".." / "input" / name
-    with open(file_path, "r") as f:
-        for line in f:
-            yield line.rstrip()
-
-
-def str_repl(s: str, idx: int, r: str) -> str:
-    return s[:idx] + r + s[idx + 1 :]
-
-
-def rotate_matrix_90_degrees(matrix: list[str]) -> list[str]:
-    transposed = ["".join(row) for row in zip(*matrix)]
-    return [row[::-1] for row in transposed]
-
-
-def run_sim_north(inp_lines: list[str]) -> list[str]:
-    # Add helper first line
-    lines = inp_lines[:]
-    lines.insert(0, "#" * len(lines[0]))
-
-    # Counts round rocks encountered on each index
-    mask = [0 for _ in lines[0]]
-
-    # Holds the data after running the simulation
-    transformed_lines: list[str] = []
-
-    for line in reversed(lines):
-        # 1. Insert line without round rocks
-        transformed_lines.insert(0, line.replace("O", "."))
-
-        # 2. Collect '#'s indexes, modify mask that counts 'O's encountered
-        square_rock_idxs: list[int] = []
-        for i, ch in enumerate(line):
-            if ch == "O":
-                mask[i] += 1
-            if ch == "#":
-                square_rock_idxs.append(i)
-
-        # Count of 'O's for each '#' index
-        counts = [mask[i] for i in square_rock_idxs]
-
-        # 3. While there are 'O's to place, modify lines below current line
-        line_idx_to_change = 1  # Pointer to lines below current, for placing 'O's
-        while not all(count == 0 for count in counts):
-            # Iterate over all '#' idx and count pair
-            for i in range(len(counts)):
-                count = counts[i]
-                curr_sq_rock_idx = square_rock_idxs[i]
-
-                # If remaining count: place 'O' in lines below
-                if count > 0:
-                    transformed_lines[line_idx_to_change] = str_repl(
-                        transformed_lines[line_idx_to_change], curr_sq_rock_idx, "O"
-                    )
-
-                    mask[curr_sq_rock_idx] -= 1  # Count 'O's: 1 less to place
-                    counts = [mask[i] for i in square_rock_idxs]  # Recompute counts
-
-            line_idx_to_change += 1
-
-    # Remove helper first line
-    transformed_lines = transformed_lines[1:]
-
-    return transformed_lines
-
-
-def count_total_load(lines: list[str]) -> int:
+def count_total_load(grid: Grid) -> int:
     total = 0
-    for i, line in enumerate(lines):
-        weight = len(lines) - i
-        num_rocks = sum(1 for ch in line if ch == "O")
-
-        total += num_rocks * weight
+    for i, row in enumerate(grid):
+        weight = grid.rows - i
+        total += row.count(b"O") * weight
 
     return total
 
 
-def main():
+def solve(part: int, inp: InputFile) -> int:
     num_cycles = 1_000_000_000
     # num_cycles = 15
-    part, mode = get_args()
 
     if part == 1:
-        lines = list(read_input(mode))
+        with phase("parse"):
+            grid = Grid.from_buffer(inp.buffer)
+
+        with phase("solve"):
+            tilt_north(grid)
+
+        with phase("aggregate"):
+            total_load = count_total_load(grid)
 
-        transformed_lines = run_sim_north(lines)
-        total_load = count_total_load(transformed_lines)
+        return total_load
 
-        print("SOLUTION:", total_load)
     if part == 2:
-        lines = list(read_input(mode))
+        with phase("parse"):
+            grid = Grid.from_buffer(inp.buffer)
 
-        matrix_configurations: list[str] = []
+        # Tilting north in each clockwise turn of the grid tilts it N, W, S, E
+        turns = [grid]
+        for _ in range(3):
+            turns.append(turns[-1].rotate())
+
+        seen_configurations: dict[bytes, int] = {}
         loads: list[int] = []
 
-        matrix = lines
         for cycle in range(num_cycles):
-            print("Running cycle:", cycle)
+            with phase("solve"):
+                for turn in turns:
+                    tilt_north(turn)
+
+            encoded_sim_res = bytes(grid.data)
 
-            for i in range(4):
-                matrix = run_sim_north(matrix)
-                matrix = rotate_matrix_90_degrees(matrix)
+            if (i := seen_configurations.get(encoded_sim_res)) is not None:
+                loads = loads[i:]
 
-            encoded_sim_res = "".join(matrix)
+                remaining = num_cycles - cycle - 1
 
-            for i in range(len(matrix_configurations)):
-                if matrix_configurations[i] == encoded_sim_res:
-                    loads = loads[i:]
+                idx = remaining % len(loads)
+                return loads[idx]
 
-                    remaining = num_cycles - cycle - 1
+            with phase("aggregate"):
+                load_after_cycle = count_total_load(grid)
+            loads.append(load_after_cycle)
 
-                    idx = remaining % len(loads)
+            seen_configurations[encoded_sim_res] = cycle
 
-                    # print("matrix configs=", list(range(len(matrix_configurations))))
-                    # print("loads=", loads)
-                    # print("repeating element at:", i)
-                    # print("found in cycle:", cycle)
-                    # print("cycle len:", cycle_len)
-                    # print("remaining steps:", remaining)
-                    # print("idx:", idx)
-                    print("SOLUTION:", loads[idx])
-                    return
+        return count_total_load(grid)
 
-            load_after_cycle = count_total_load(matrix)
-            loads.append(load_after_cycle)
+    raise ValueError(f"Unknown part: {part}")
+
+
+def main():
+    part, mode = get_args()
 
-            matrix_configurations.append(encoded_sim_res)
+    print("SOLUTION:", solve(part, read_input(__file__, mode)))
 
 
 if __name__ == "__main__":
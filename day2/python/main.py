@@ -1,7 +1,13 @@
 import math
 import sys
-from collections import defaultdict
-from typing import Iterator
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping, Self, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.io import InputFile, get_args, read_input  # noqa: E402
+from aoc.profiling import phase  # noqa: E402
 
 AVAILABLE_CUBES = {
     "red": 12,
@@ -9,120 +15,164 @@ AVAILABLE_CUBES = {
     "blue": 14,
 }
 
-
-def split_off_game_id(line: str) -> tuple[int, str]:
-    game_num, game_info = line.removeprefix("Game ").split(":", 1)
-
-    return int(game_num), game_info
-
-
-def get_game_sets(line: str) -> list[str]:
-    sets = [s.strip() for s in line.split(";")]
-
-    return sets
-
-
-def get_set_cubes(a_set: str) -> dict[str, int]:
-    # You may find this too readable
-    # set_cubes = {}
-
-    # num_color_groups = a_set.split(", ")
-
-    # for num_color in num_color_groups:
-    #     elems = num_color.split(" ")
-
-    #     quant, color = int(elems[0]), elems[1]
-
-    #     set_cubes[color] = quant
-
-    # return set_cubes
-
-    # In that case, use this
-    return {
-        color: int(quant)
-        for num_color in a_set.split(", ")
-        for quant, color in (num_color.split(" "),)
-    }
-
-
-def is_valid_cube_quantities(set_cubes: dict[str, int]) -> bool:
-    return all(AVAILABLE_CUBES[color] >= quant for color, quant in set_cubes.items())
-
-
-def is_valid_game(game_sets: list[str]) -> bool:
-    # Sane approach
-    # for game_set in game_sets:
-    #     set_cubes = get_set_cubes(game_set)
-
-    #     if not is_valid_cube_quantities(set_cubes):
-    #         return False
-
-    # return True
-
-    # "Short" approach
-    return all(
-        is_valid_cube_quantities(get_set_cubes(game_set)) for game_set in game_sets
-    )
-
-
-def get_args() -> tuple[int, str]:
-    if len(sys.argv) != 3:
-        print("Usage: python main.py <1 or 2> <example or full>")
-        sys.exit(1)
-
-    part = int(sys.argv[1])
+COLORS = tuple(AVAILABLE_CUBES)
+
+
+# Color words are told apart by their first letter, and skipped by their length
+COLOR_CODES = {ord(color[0]): code for code, color in enumerate(COLORS)}
+COLOR_LENGTHS = tuple(len(color) for color in COLORS)
+
+
+def tokenize(data: memoryview) -> Iterator[tuple[int, int, int]]:
+    """Yield (game_id, color_code, quantity) for every group of cubes in the log.
+
+    Walks the raw bytes once, relying on the fixed layout of a line
+    ("Game <id>: <n> <color>, <n> <color>; ..."), so numbers are accumulated
+    digit by digit and no strings, lists or dicts are created along the way.
+    `color_code` indexes `COLORS`.
+    """
+    end = len(data)
+
+    pos = 0
+    while pos < end:
+        if data[pos] in b"\r\n":  # Blank line
+            pos += 1
+            continue
+
+        pos += len("Game ")
+        game_id = 0
+        while (byte := data[pos]) != ord(":"):
+            game_id = game_id * 10 + byte - ord("0")
+            pos += 1
+        pos += 1
+
+        while True:
+            pos += 1  # Space before the quantity
+            quant = 0
+            while (byte := data[pos]) != ord(" "):
+                quant = quant * 10 + byte - ord("0")
+                pos += 1
+
+            color = COLOR_CODES[data[pos + 1]]
+            pos += 1 + COLOR_LENGTHS[color]
+            yield game_id, color, quant
+
+            # Then one of ",", ";", a line break or the end of the log
+            if pos >= end:
+                break
+            sep = data[pos]
+            pos += 1
+            if sep == ord("\r"):
+                pos += 1
+                break
+            if sep == ord("\n"):
+                break
+
+
+class GameLog:
+    """The game log parsed once into columns: the game IDs, and per color the most
+    cubes of that color shown at once in each game.
+
+    A game is possible with a bag exactly when the bag holds at least these maxima,
+    and its power is their product, so no query needs the sets themselves again.
+    """
+
+    def __init__(self) -> None:
+        self.ids = array("q")
+        self.max_cubes = {color: array("q") for color in COLORS}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def scan(cls, tokens: Iterable[tuple[int, int, int]]) -> Self:
+        """Build the columns from `tokenize` output, in a single pass."""
+        log = cls()
+        ids = log.ids
+        columns = [log.max_cubes[color] for color in COLORS]
+
+        game_id = None
+        for token_game_id, color, quant in tokens:
+            if token_game_id != game_id:
+                game_id = token_game_id
+                ids.append(game_id)
+                for column in columns:
+                    column.append(0)
+
+            column = columns[color]
+            if quant > column[-1]:
+                column[-1] = quant
+
+        return log
+
+    def valid_id_sum(self, bag: Mapping[str, int]) -> int:
+        red, green, blue = (bag[color] for color in COLORS)
+
+        return sum(
+            game_id
+            for game_id, r, g, b in zip(self.ids, *self.max_cubes.values())
+            if r <= red and g <= green and b <= blue
+        )
+
+    def power_sum(self) -> int:
+        # A color a game never shows is left out of its power, not counted as 0
+        return sum(
+            math.prod(n for n in maxima if n)
+            for maxima in zip(*self.max_cubes.values())
+        )
+
+    def query_bags(
+        self, bags: Sequence[Mapping[str, int]], max_cells: int = 2**24
+    ) -> tuple[list[int], list[int]]:
+        """Valid-ID sums and power sums of the possible games, for every bag.
+
+        All bags are compared against all games with numpy, `max_cells` caps the
+        size of the bags x games comparison done in one go.
+        """
+        import numpy as np
+
+        ids = np.frombuffer(self.ids, dtype=np.int64)
+        maxima = np.stack(
+            [np.frombuffer(self.max_cubes[color], dtype=np.int64) for color in COLORS]
+        )
+        powers = np.where(maxima > 0, maxima, 1).prod(axis=0)
+        limits = np.array(
+            [[bag[color] for color in COLORS] for bag in bags], dtype=np.int64
+        ).reshape(-1, len(COLORS))
+
+        id_sums: list[int] = []
+        power_sums: list[int] = []
+
+        block = max(1, max_cells // (len(COLORS) * max(len(ids), 1)))
+        for start in range(0, len(limits), block):
+            # possible[i, j]: game j fits in bag i
+            possible = (maxima <= limits[start : start + block, :, None]).all(axis=1)
+            id_sums.extend((possible @ ids).tolist())
+            power_sums.extend((possible @ powers).tolist())
+
+        return id_sums, power_sums
+
+
+def solve_both(inp: InputFile) -> tuple[int, int]:
+    """Both parts from a single scan of the log."""
+    with phase("parse"):
+        log = GameLog.scan(tokenize(inp.buffer))
+
+    with phase("solve"):
+        return log.valid_id_sum(AVAILABLE_CUBES), log.power_sum()
+
+
+def solve(part: int, inp: InputFile) -> int:
     if part not in (1, 2):
-        print("First argument must be either 1 or 2")
-        sys.exit(1)
-
-    mode = sys.argv[2]
-    if mode not in ("example", "full"):
-        print("Second argument must be either example or full")
-        sys.exit(1)
-
-    return part, mode
+        raise ValueError(f"Unknown part: {part}")
 
-
-def read_input(name: str) -> Iterator[str]:
-    with open(f"../input/{name}", "r") as f:
-        for line in f:
-            yield line.rstrip()
+    return solve_both(inp)[part - 1]
 
 
 def main():
     part, mode = get_args()
 
-    if part == 1:
-        sum_valid_ids = 0
-
-        for line in read_input(mode):
-            game_id, game_info = split_off_game_id(line)
-
-            game_sets = get_game_sets(game_info)
-
-            if is_valid_game(game_sets):
-                sum_valid_ids += game_id
-
-        print(sum_valid_ids)
-
-    if part == 2:
-        sum_cube_powers = 0
-
-        for line in read_input(mode):
-            _, game_info = split_off_game_id(line)
-            game_sets = get_game_sets(game_info)
-
-            max_quant_cubes = defaultdict(int)
-            for game_set in game_sets:
-                set_cubes = get_set_cubes(game_set)
-
-                for color, quant in set_cubes.items():
-                    max_quant_cubes[color] = max(max_quant_cubes[color], quant)
-
-            power_of_cubes = math.prod(max_quant_cubes.values())
-            sum_cube_powers += power_of_cubes
-
-        print(sum_cube_powers)
+    print(solve(part, read_input(__file__, mode)))
 
 
 if __name__ == "__main__":
@@ -1,33 +1,13 @@
 import math
 import re
 import sys
-from typing import Iterator
+from pathlib import Path
+from typing import Iterable
 
-import numpy as np
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-
-def get_args() -> tuple[int, str]:
-    if len(sys.argv) != 3:
-        print("Usage: python main.py <1 or 2> <example or full>")
-        sys.exit(1)
-
-    part = int(sys.argv[1])
-    if part not in (1, 2):
-        print("First argument must be either 1 or 2")
-        sys.exit(1)
-
-    mode = sys.argv[2]
-    if mode not in ("example", "full"):
-        print("Second argument must be either example or full")
-        sys.exit(1)
-
-    return part, mode
-
-
-def read_input(name: str) -> Iterator[str]:
-    with open(f"../input/{name}", "r") as f:
-        for line in f:
-            yield line.rstrip()
+from aoc.io import get_args, read_input  # noqa: E402
+from aoc.profiling import phase  # noqa: E402
 
 
 def count_series_points(time_avail: int, dist_record: int) -> int:
@@ -42,6 +22,9 @@ def count_series_points(time_avail: int, dist_record: int) -> int:
     The function calculates how many points in this series exceed a given distance record,
     by solving for the quadratic inequality (N - n) * n > t == -n^2 + Nn - t > 0
 
+    The roots are found with integer square roots only, so the count stays exact
+    for arbitrarily large N and t.
+
     Args:
         time_avail (int): The total time available (N in the series formula).
         dist_record (int): The distance record to compare against.
@@ -49,16 +32,35 @@ def count_series_points(time_avail: int, dist_record: int) -> int:
     Returns:
         int: The number of points in the series exceeding the distance record.
     """
-    # Adding epsilon to ensure distances equal to record are not counted
-    thresh = dist_record + 1e-6
+    discriminant = time_avail * time_avail - 4 * dist_record
+    if discriminant <= 0:
+        return 0
+
+    def beats_record(n: int) -> bool:
+        return (time_avail - n) * n > dist_record
 
-    coefficients = [-1, time_avail, -thresh]
+    # First winning n, starting from the isqrt estimate of the lower root. The
+    # roots can be less than 1 apart with no integer between them, then none wins.
+    first = max((time_avail - math.isqrt(discriminant)) // 2, 0)
+    while first > 0 and beats_record(first - 1):
+        first -= 1
+    while not beats_record(first):
+        first += 1
+        if 2 * first > time_avail:
+            return 0
 
-    roots = np.roots(coefficients)
+    # The series is symmetric around N / 2, so the last winning n is N - first
+    return time_avail - 2 * first + 1
 
-    num_points = np.ceil(roots.max()) - np.ceil(roots.min())
 
-    return int(num_points)
+def count_series_points_batch(
+    times_avail: Iterable[int], dist_records: Iterable[int]
+) -> list[int]:
+    """`count_series_points` for every (time, record) pair, e.g. all races of a sheet."""
+    return [
+        count_series_points(int(time_avail), int(dist_record))
+        for time_avail, dist_record in zip(times_avail, dist_records, strict=True)
+    ]
 
 
 def parse_input_line_part1(line: str) -> list[int]:
@@ -75,21 +77,35 @@ def parse_input_line_part2(line: str) -> int:
     return num
 
 
-def main():
-    part, mode = get_args()
-
+def solve(part: int, lines: Iterable[str]) -> int:
     if part == 1:
-        times, dists = [parse_input_line_part1(line) for line in read_input(mode)]
+        with phase("parse"):
+            times, dists = [parse_input_line_part1(line) for line in lines]
+
+        with phase("solve"):
+            counts = count_series_points_batch(times, dists)
 
-        solution = math.prod(count_series_points(t, d) for t, d in zip(times, dists))
+        with phase("aggregate"):
+            solution = math.prod(counts)
 
-        print("SOLUTION:", solution)  # 781200
+        return solution  # 781200
 
     if part == 2:
-        time, dist = [parse_input_line_part2(line) for line in read_input(mode)]
-        solution = count_series_points(time, dist)
+        with phase("parse"):
+            time, dist = [parse_input_line_part2(line) for line in lines]
+
+        with phase("solve"):
+            solution = count_series_points(time, dist)
+
+        return solution  # 49240091
+
+    raise ValueError(f"Unknown part: {part}")
+
+
+def main():
+    part, mode = get_args()
 
-        print("SOLUTION:", solution)  # 49240091
+    print("SOLUTION:", solve(part, read_input(__file__, mode)))
 
 
 if __name__ == "__main__":
@@ -1,35 +1,14 @@
-import numpy as np
+import random
 
+from main import count_series_points, count_series_points_batch
 
-def count_series_points(time_avail: int, dist_record: int) -> int:
-    """
-    Count the number of points in a series where the value is strictly greater than a given record.
 
-    The series is defined by the formula a_n = (N - n) * n, where:
-    - N is the total time available.
-    - n is an integer ranging from 0 to N (inclusive).
-    - a_n is the value at each point in the series.
+def brute_force(time_avail: int, dist_record: int) -> int:
+    return sum(1 for n in range(time_avail + 1) if (time_avail - n) * n > dist_record)
 
-    The function calculates how many points in this series exceed a given distance record,
-    by solving for the quadratic inequality (N - n) * n > t == -n^2 + Nn - t > 0
 
-    Args:
-        time_avail (int): The total time available (N in the series formula).
-        dist_record (int): The distance record to compare against.
-
-    Returns:
-        int: The number of points in the series exceeding the distance record.
-    """
-    # Adding epsilon to ensure distances equal to record are not counted
-    thresh = dist_record + 1e-6
-
-    coefficients = [-1, time_avail, -thresh]
-
-    roots = np.roots(coefficients)
-
-    num_points = np.ceil(roots.max()) - np.ceil(roots.min())
-
-    return int(num_points)
+def beats_record(time_avail: int, dist_record: int, n: int) -> bool:
+    return (time_avail - n) * n > dist_record
 
 
 Ns = [7, 15, 30]
@@ -38,4 +17,42 @@ ts = [9, 40, 200]
 res = [count_series_points(N, t) for N, t in zip(Ns, ts)]
 
 assert res == [4, 8, 9]
+assert count_series_points_batch(Ns, ts) == res
 print(res)
+
+rng = random.Random(6)
+
+# Small races against brute force, records hitting a reachable distance exactly
+# (a tie is not a win) included
+Ns = [rng.randint(0, 200) for _ in range(20_000)]
+ts: list[int] = []
+for N in Ns:
+    if rng.random() < 0.5:
+        n = rng.randint(0, N)
+        ts.append((N - n) * n)
+    else:
+        ts.append(rng.randint(0, N * N // 4 + 2))
+
+assert count_series_points_batch(Ns, ts) == [brute_force(N, t) for N, t in zip(Ns, ts)]
+print(f"{len(Ns)} small races match brute force")
+
+# Races far past 2^53, where floats cannot tell the roots apart. Brute force is
+# out of reach, so check that the count puts the first and last wins exactly on
+# the boundary of the winning range.
+Ns = [rng.randint(2**53, 2**200) for _ in range(2_000)]
+ts = []
+for N in Ns:
+    n = rng.randint(0, N // 2)
+    ts.append((N - n) * n - rng.randint(0, 1))
+
+for N, t, count in zip(Ns, ts, count_series_points_batch(Ns, ts)):
+    if count == 0:
+        assert not beats_record(N, t, N // 2)
+        continue
+
+    first = (N - count + 1) // 2
+    last = N - first
+
+    assert beats_record(N, t, first) and beats_record(N, t, last)
+    assert not beats_record(N, t, first - 1) and not beats_record(N, t, last + 1)
+print(f"{len(Ns)} large races are exact")
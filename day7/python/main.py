@@ -1,10 +1,18 @@
 import sys
-from collections import Counter
+from array import array
 from enum import Enum, auto
-from functools import cmp_to_key
-from typing import Iterator, Self
+from pathlib import Path
+from typing import Iterable, Self
 
-from sortedcontainers import SortedList
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.io import get_args, read_input  # noqa: E402
+from aoc.profiling import phase  # noqa: E402
+
+# Card symbols as the hex digit of their `Card.value` (`joker_value` in part 2), so
+# int(..., 16) of a translated hand packs all its card values at once, 4 bits each
+CARD_HEX = str.maketrans("TJQKA", "abcde")
+JOKER_CARD_HEX = str.maketrans("TJQKA", "a1cde")
 
 
 class HandType(Enum):
@@ -18,6 +26,8 @@ class HandType(Enum):
 
 
 class Card:
+    __slots__ = ("symbol", "value", "joker_value")
+
     @classmethod
     def symbol_to_value(cls, sym: str, part: int = 1) -> int:
         sym_to_val: dict[str, int] = {
@@ -38,36 +48,21 @@ class Card:
 
         return int(sym)
 
-    def __init__(self, symbol: str, part: int = 1) -> None:
+    def __init__(self, symbol: str) -> None:
         self.symbol: str = symbol
-        self.value: int = self.symbol_to_value(symbol, part)
+        self.value: int = self.symbol_to_value(symbol, part=1)
+        self.joker_value: int = self.symbol_to_value(symbol, part=2)
 
     def __repr__(self) -> str:
         return self.symbol
 
 
 class Hand:
-    @classmethod
-    def calculate_hand_type(cls, cards: list[Card], part: int) -> HandType:
-        def _transform_jokers(cards: list[Card]) -> None:
-            """Transform the Joker symbols to the most common other symbol, or Aces if cards are all Jokers."""
-            occurrence_counter = Counter(c.symbol for c in cards if c.symbol != "J")
-
-            if not occurrence_counter:
-                to_replace_sym = "A"
-            else:
-                to_replace_sym = occurrence_counter.most_common(1)[0][0]
-
-            for c in cards:
-                if c.symbol == "J":
-                    c.symbol = to_replace_sym
-
-        if part == 2:
-            _transform_jokers(cards)
-
-        occurrence_counter = Counter(c.symbol for c in cards)
-        occurrences = sorted(occurrence_counter.values())
+    __slots__ = ("cards", "bid", "type", "joker_type", "sort_key", "joker_sort_key")
 
+    @classmethod
+    def type_from_occurrences(cls, occurrences: list[int]) -> HandType:
+        """The hand type for the ascending occurrence counts of its symbols."""
         match occurrences:
             case [5]:
                 return HandType.FIVE_OF_A_KIND
@@ -85,91 +80,259 @@ class Hand:
                 return HandType.HIGH_CARD
 
     @classmethod
-    def parse_line_to_hand(cls, line: str, part: int = 1) -> Self:
+    def calculate_hand_types(cls, symbols: str) -> tuple[HandType, HandType]:
+        """The hand type as dealt and with Jokers played as wildcards (part 2).
+
+        Both come from one occurrence count. The best use of the Jokers is always
+        to join the most common other symbol, so their count is added to the
+        largest of the others (five Jokers are five of a kind).
+        """
+        occurrences = sorted(map(symbols.count, set(symbols)))
+        hand_type = cls.type_from_occurrences(occurrences)
+
+        jokers = symbols.count("J")
+        if not jokers or jokers == len(symbols):
+            return hand_type, hand_type
+
+        occurrences.remove(jokers)
+        occurrences[-1] += jokers
+
+        return hand_type, cls.type_from_occurrences(occurrences)
+
+    @classmethod
+    def parse_line_to_hand(cls, line: str) -> Self:
         card_str, bid_str = line.split()
-        cards = [Card(c, part) for c in card_str]
+        cards = [Card(c) for c in card_str]
         bid = int(bid_str)
 
-        return cls(cards, bid, part)
+        return cls(cards, bid)
 
     @classmethod
-    def compare_hands(cls, a: Self, b: Self) -> int:
-        """Comparator function for two Hand objects.
+    def pack_sort_key(cls, hand_type: HandType, symbols: str, part: int = 1) -> int:
+        """Encode a hand into one integer that sorts like the hand ranks.
 
-        Compares based on HandType, if they are the same, then the first high card in order wins.
+        The HandType sits in the high bits, followed by 4 bits per card value in
+        order, so a stronger type always wins and equal types fall back to the
+        first differing card.
         """
-        if a.type.value < b.type.value:
-            return -1
-        elif a.type.value > b.type.value:
-            return 1
-        else:
-            for ca, cb in zip(a.cards, b.cards):
-                if ca.value < cb.value:
-                    return -1
-                elif ca.value > cb.value:
-                    return 1
-            return 0
-
-    def __init__(self, cards: list[Card], bid: int, part: int = 1) -> None:
+        card_hex = CARD_HEX if part == 1 else JOKER_CARD_HEX
+        return hand_type.value << 4 * len(symbols) | int(
+            symbols.translate(card_hex), 16
+        )
+
+    def __init__(self, cards: list[Card], bid: int) -> None:
         self.cards = cards
         self.bid = bid
-        self.type = self.calculate_hand_type(cards, part)
+        symbols = "".join(c.symbol for c in cards)
+        self.type, self.joker_type = self.calculate_hand_types(symbols)
+        self.sort_key = self.pack_sort_key(self.type, symbols, part=1)
+        self.joker_sort_key = self.pack_sort_key(self.joker_type, symbols, part=2)
+
+    def part_sort_key(self, part: int) -> int:
+        return self.sort_key if part == 1 else self.joker_sort_key
 
     def __repr__(self) -> str:
         return f"Hand({self.cards} ({self.type.name}), ${self.bid})"
 
 
-def get_args() -> tuple[int, str]:
-    if len(sys.argv) != 3:
-        print("Usage: python main.py <1 or 2> <example or full>")
-        sys.exit(1)
+class HandStore:
+    """Hands as parallel arrays of their two packed sort keys and their bids.
 
-    part = int(sys.argv[1])
-    if part not in (1, 2):
-        print("First argument must be either 1 or 2")
-        sys.exit(1)
+    A hand costs 16 bytes here: a 4-byte key per part (keys stay below 2^23) and
+    an 8-byte bid. A `Hand` with its five `Card`s is about 570 bytes of objects
+    with `__slots__`, and about 770 bytes without.
+    """
 
-    mode = sys.argv[2]
+    __slots__ = ("keys", "joker_keys", "bids")
 
-    return part, mode
+    def __init__(self) -> None:
+        self.keys = array("i")
+        self.joker_keys = array("i")
+        self.bids = array("q")
 
+    def __len__(self) -> int:
+        return len(self.bids)
 
-def read_input(name: str) -> Iterator[str]:
-    with open(f"../input/{name}", "r") as f:
-        for line in f:
-            yield line.rstrip()
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> Self:
+        store = cls()
+        for line in lines:
+            symbols, bid_str = line.split()
+            store.add(symbols, int(bid_str))
 
+        return store
 
-def main():
-    part, mode = get_args()
+    def add(self, symbols: str, bid: int) -> None:
+        hand_type, joker_type = Hand.calculate_hand_types(symbols)
+        self.keys.append(Hand.pack_sort_key(hand_type, symbols, part=1))
+        self.joker_keys.append(Hand.pack_sort_key(joker_type, symbols, part=2))
+        self.bids.append(bid)
+
+    def ranked_bids(self, part: int) -> list[int]:
+        """The bids from the weakest to the strongest hand by the rules of `part`."""
+        keys = self.keys if part == 1 else self.joker_keys
+
+        # Sort plain ints, the hand's position packed below its key, which also
+        # keeps equal hands in input order like a stable sort would
+        idx_bits = len(keys).bit_length()
+        ranked = sorted(key << idx_bits | idx for idx, key in enumerate(keys))
+
+        mask = (1 << idx_bits) - 1
+        bids = self.bids
+        return [bids[packed & mask] for packed in ranked]
+
+
+def total_winnings(ranked_bids: list[int]) -> int:
+    """Sum of rank * bid over bids in rank order."""
+    solution = 0
+    for rank, bid in enumerate(ranked_bids, start=1):
+        solution += rank * bid
+
+    return solution
+
+
+class FenwickTree:
+    """Prefix sums over the indexes 1..size, with O(log size) updates and queries.
+
+    Only the nodes on the update paths are stored, so a huge and mostly empty
+    index range costs nothing until it is used.
+    """
 
-    if part == 1:
-        solution = 0
-        sorted_list = SortedList(key=cmp_to_key(Hand.compare_hands))
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.tree: dict[int, int] = {}
 
-        for line in read_input(mode):
-            hand = Hand.parse_line_to_hand(line)
-            sorted_list.add(hand)
+    def add(self, idx: int, delta: int) -> None:
+        while idx <= self.size:
+            self.tree[idx] = self.tree.get(idx, 0) + delta
+            idx += idx & -idx
 
-        for rank, hand in enumerate(sorted_list, start=1):
-            solution += rank * hand.bid
+    def prefix_sum(self, idx: int) -> int:
+        """Sum of the values at the indexes 1..idx."""
+        total = 0
+        while idx > 0:
+            total += self.tree.get(idx, 0)
+            idx -= idx & -idx
 
-        print("SOLUTION:", solution)
-        assert solution == 251216224
+        return total
 
-    if part == 2:
-        solution = 0
-        sorted_list = SortedList(key=cmp_to_key(Hand.compare_hands))
 
-        for line in read_input(mode):
-            hand = Hand.parse_line_to_hand(line, part=2)
-            sorted_list.add(hand)
+class Winnings:
+    """The total winnings of a changing set of hands, kept up to date per change.
+
+    Hands are indexed by their sort key for `part` in two Fenwick trees, one
+    counting hands and one summing bids. Adding a hand moves every stronger hand
+    up one rank, which adds the sum of their bids to the total, plus the new
+    hand's own rank * bid. Removing does the reverse. Every change and rank
+    lookup is O(log) in the size of the key space, plus the number of equal
+    hands.
+
+    Equal hands rank in the order they were added, like the stable sort of
+    `HandStore`, so each key keeps the bids of its hands in that order.
+    """
+
+    # Packed keys have the HandType above 4 bits for each of the 5 cards
+    KEY_LIMIT = (len(HandType) + 1) << 20
+
+    def __init__(self, part: int) -> None:
+        if part not in (1, 2):
+            raise ValueError(f"Unknown part: {part}")
+
+        self.part = part
+        self.total = 0
+        self.size = 0
+        self.bids: dict[int, list[int]] = {}
+        self.bid_total = 0
+        self.counts = FenwickTree(self.KEY_LIMIT)
+        self.bid_sums = FenwickTree(self.KEY_LIMIT)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, hand: Hand) -> bool:
+        return hand.bid in self.bids.get(hand.part_sort_key(self.part), ())
+
+    def _locate(self, hand: Hand) -> tuple[int, int]:
+        """The key of a ranked hand and its position among the equal hands.
+
+        Equal hands with equal bids are interchangeable, so the first is taken.
+        """
+        key = hand.part_sort_key(self.part)
+        if hand not in self:
+            raise KeyError(f"Hand not ranked: {hand}")
+
+        return key, self.bids[key].index(hand.bid)
+
+    def add(self, hand: Hand) -> int:
+        """Rank a new hand above its equals, returning the updated total winnings."""
+        key = hand.part_sort_key(self.part)
+
+        rank = self.counts.prefix_sum(key) + 1
+        stronger_bids = self.bid_total - self.bid_sums.prefix_sum(key)
+        self.total += rank * hand.bid + stronger_bids
+
+        self.bids.setdefault(key, []).append(hand.bid)
+        self.size += 1
+        self.bid_total += hand.bid
+        self.counts.add(key, 1)
+        self.bid_sums.add(key, hand.bid)
+
+        return self.total
+
+    def remove(self, hand: Hand) -> int:
+        """Drop a ranked hand, returning the updated total winnings."""
+        key, pos = self._locate(hand)
+        equal_bids = self.bids[key]
+
+        rank = self.counts.prefix_sum(key - 1) + pos + 1
+        stronger_bids = (
+            self.bid_total - self.bid_sums.prefix_sum(key) + sum(equal_bids[pos + 1 :])
+        )
+        self.total -= rank * hand.bid + stronger_bids
+
+        del equal_bids[pos]
+        if not equal_bids:
+            del self.bids[key]
+        self.size -= 1
+        self.bid_total -= hand.bid
+        self.counts.add(key, -1)
+        self.bid_sums.add(key, -hand.bid)
+
+        return self.total
+
+    def rank(self, hand: Hand) -> int:
+        """The 1-based rank of a ranked hand, 1 being the weakest."""
+        key, pos = self._locate(hand)
+        return self.counts.prefix_sum(key - 1) + pos + 1
+
+
+def solve_both(lines: Iterable[str]) -> tuple[int, int]:
+    """Both parts from a single parse of the hands."""
+    with phase("parse"):
+        store = HandStore.from_lines(lines)
+
+    with phase("solve"):
+        ranked = [store.ranked_bids(part) for part in (1, 2)]
+
+    with phase("aggregate"):
+        return total_winnings(ranked[0]), total_winnings(ranked[1])
+
+
+def solve(part: int, lines: Iterable[str]) -> int:
+    if part not in (1, 2):
+        raise ValueError(f"Unknown part: {part}")
+
+    return solve_both(lines)[part - 1]
+
+
+def main():
+    part, mode = get_args()
 
-        for rank, hand in enumerate(sorted_list, start=1):
-            solution += rank * hand.bid
+    solution = solve(part, read_input(__file__, mode))
+    print("SOLUTION:", solution)
 
-        print("SOLUTION:", solution)
-        assert solution == 250825971
+    if mode == "full":
+        assert solution == {1: 251216224, 2: 250825971}[part]
 
 
 if __name__ == "__main__":
@@ -1,36 +1,27 @@
-import itertools as it
-import multiprocessing
+import functools as ft
+import os
 import sys
-from math import lcm
+from array import array
+from math import gcd
 from pathlib import Path
-from typing import Iterator
-
-type MapLine = tuple[str, tuple[str, str]]
+from typing import TYPE_CHECKING, Callable, Iterable, NamedTuple, Sequence
 
+if TYPE_CHECKING:
+    from multiprocessing.shared_memory import SharedMemory
 
-def get_args() -> tuple[int, str]:
-    if len(sys.argv) != 3:
-        print("Usage: python main.py <1 or 2> <example or full>")
-        sys.exit(1)
-
-    part = int(sys.argv[1])
-    if part not in (1, 2):
-        print("First argument must be either 1 or 2")
-        sys.exit(1)
+    import numpy as np
 
-    mode = sys.argv[2]
-    if mode not in ("example", "full"):
-        print("Second argument must be either example or full")
-        sys.exit(1)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-    return part, mode
+from aoc.io import InputFile, get_args, read_input  # noqa: E402
+from aoc.profiling import phase  # noqa: E402
 
+type MapLine = tuple[str, tuple[str, str]]
 
-def read_input(name: str) -> Iterator[str]:
-    file_path = Path(__file__).parent / ".." / "input" / name
-    with open(file_path, "r") as f:
-        for line in f:
-            yield line.rstrip()
+# Below this size the map is compiled through a dict, quicker than importing numpy
+COMPILE_MIN_BYTES = 2**20
+# Ghosts are analysed in parallel once a walk could take this many steps
+PARALLEL_MIN_CELLS = 2**30
 
 
 def parse_line(line: str) -> MapLine:
@@ -41,67 +32,469 @@ def parse_line(line: str) -> MapLine:
     return key, dirs
 
 
-def worker_step(args: tuple[str, dict[str, tuple[str, str]], str]):
-    current_pos, maps, direction = args
-    idx = 0 if direction == "L" else 1
-    next_pos = maps[current_pos][idx]
+class Network:
+    """The map compiled to dense integer node ids.
+
+    Node `i` is called `names[i]` and leads to `left[i]` and `right[i]`, so a
+    step is an array lookup instead of a string-keyed dict lookup.
+    """
+
+    def __init__(
+        self, instructions: str, names: list[str], left: array, right: array
+    ) -> None:
+        self.instructions = instructions
+        self.names = names
+        self.left = left
+        self.right = right
+
+    @ft.cached_property
+    def ids(self) -> dict[str, int]:
+        return {name: idx for idx, name in enumerate(self.names)}
+
+    @classmethod
+    def parse(cls, lines: Iterable[str]) -> "Network":
+        lines = iter(lines)
+        instructions = next(lines)
+        map_objs = [parse_line(line) for line in lines if line != ""]
+
+        names = [key for key, _ in map_objs]
+        ids = {name: idx for idx, name in enumerate(names)}
+        network = cls(
+            instructions,
+            names,
+            array("i", (ids[left] for _, (left, _) in map_objs)),
+            array("i", (ids[right] for _, (_, right) in map_objs)),
+        )
+        network.ids = ids
+
+        return network
+
+    @classmethod
+    def from_buffer(cls, data: memoryview) -> "Network | None":
+        """Compile the map straight from the input bytes with numpy.
+
+        Resolving every edge through a dict of names costs a cache miss per edge
+        on big maps. Here names of up to 8 bytes are packed into integers instead,
+        and all edges are resolved at once with a binary search over the sorted
+        names. Returns None for longer names or anything that is not a map.
+        """
+        import numpy as np
+
+        tokens = bytes(data).split()
+        if not tokens or (len(tokens) - 1) % 4:
+            return None
+
+        names = tokens[1::4]
+        lefts = [token[1:-1] for token in tokens[3::4]]
+        rights = [token[:-1] for token in tokens[4::4]]
+        if max(map(len, names), default=0) > 8:
+            return None
+
+        def codes(names: list[bytes]) -> "np.ndarray":
+            return np.array(names, dtype="S8").view(">u8")
+
+        name_codes = codes(names)
+        order = np.argsort(name_codes)
+        sorted_codes = name_codes[order]
+
+        def resolve(targets: list[bytes]) -> array:
+            target_codes = codes(targets)
+            found = np.searchsorted(sorted_codes, target_codes)
+            found = found.clip(max=len(order) - 1)
+            if not (sorted_codes[found] == target_codes).all():
+                raise KeyError("Edge to a node that is not on the map")
+            return array("i", order[found].astype(np.intc).tobytes())
+
+        return cls(
+            tokens[0].decode(),
+            [name.decode() for name in names],
+            resolve(lefts),
+            resolve(rights),
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def moves(self) -> list[array]:
+        """The successor array to follow for each instruction, in order."""
+        return [
+            self.left if instruction == "L" else self.right
+            for instruction in self.instructions
+        ]
+
+    def step(self, node: int, instruction_idx: int) -> int:
+        """The node after taking instruction `instruction_idx` (mod its length)."""
+        instructions = self.instructions
+        if instructions[instruction_idx % len(instructions)] == "L":
+            return self.left[node]
+
+        return self.right[node]
+
+
+class JumpTable:
+    """Binary-lifting powers of one full pass over a network's instructions.
+
+    `jumps[level][node]` is where a walk starting at `node` (and at the first
+    instruction) is after 2**level passes, and `hits[level][node]` whether it
+    visits a target node on the way. `first_hit[node]` is the step within the
+    first pass on which a target is first reached, 0 for none.
+
+    Building the first level walks every node through one pass at once with
+    numpy, O(nodes * instructions). Each further level is a single O(nodes)
+    composition, after which where a walk is after k steps and when it first
+    reaches a target take O(log k) lookups (plus up to one pass of single steps
+    for where a walk ends mid-pass).
+    """
+
+    def __init__(self, network: Network, is_target: Callable[[str], bool]) -> None:
+        import numpy as np
+
+        self.network = network
+        num_nodes = len(network)
+
+        targets = np.fromiter(map(is_target, network.names), bool, num_nodes)
+        left = np.frombuffer(network.left, dtype=np.intc)
+        right = np.frombuffer(network.right, dtype=np.intc)
+
+        pos = np.arange(num_nodes, dtype=np.intc)
+        first_hit = np.zeros(num_nodes, dtype=np.int64)
+        for step, instruction in enumerate(network.instructions, start=1):
+            pos = (left if instruction == "L" else right)[pos]
+            first_hit[targets[pos] & (first_hit == 0)] = step
+
+        self.targets = targets
+        self.first_hit = first_hit
+        self.jumps: list["np.ndarray"] = [pos]
+        self.hits: list["np.ndarray"] = [first_hit > 0]
+
+        # Pass starts repeat within num_nodes passes, so a walk that reaches no
+        # target within that many passes never does
+        while 1 << (len(self.jumps) - 1) < num_nodes:
+            self._add_level()
+
+    def _add_level(self) -> None:
+        jump, hits = self.jumps[-1], self.hits[-1]
+        self.jumps.append(jump[jump])
+        self.hits.append(hits | hits[jump])
+
+    def after(self, node: int, steps: int) -> int:
+        """The node a walk starting at `node` is on after `steps` steps."""
+        passes, rest = divmod(steps, len(self.network.instructions))
+        while passes >> len(self.jumps):
+            self._add_level()
+
+        level = 0
+        while passes:
+            if passes & 1:
+                node = int(self.jumps[level][node])
+            passes >>= 1
+            level += 1
+
+        for instruction_idx in range(rest):
+            node = self.network.step(node, instruction_idx)
+
+        return node
+
+    def steps_to_target(self, node: int) -> int | None:
+        """Steps until a walk starting at `node` first reaches a target, if ever.
+
+        Starting on a target does not count, the walk has to arrive on one.
+        """
+        if not self.hits[-1][node]:
+            return None
+
+        passes = 0
+        for level in reversed(range(len(self.jumps))):
+            if not self.hits[level][node]:
+                node = int(self.jumps[level][node])
+                passes += 1 << level
+
+        return passes * len(self.network.instructions) + int(self.first_hit[node])
+
+
+# Building a JumpTable costs about as much as this many plain steps per node and
+# instruction, on top of importing numpy, so short walks are cheaper to just take
+WALK_STEPS_PER_TABLE_CELL = 1 / 16
+WALK_MIN_STEPS = 100_000
+
+
+def steps_to_targets(
+    network: Network, starts: list[int], is_target: Callable[[str], bool]
+) -> list[int]:
+    """Steps from each start until its walk first arrives on a target node.
+
+    Each start is walked step by step first. Once the walks have taken about as
+    long as building a JumpTable would, the remaining starts are answered by one,
+    so short walks never pay for the table and long ones are not simulated.
+    """
+    targets = [is_target(name) for name in network.names]
+    moves = network.moves()
+    budget = WALK_MIN_STEPS + int(len(network) * len(moves) * WALK_STEPS_PER_TABLE_CELL)
+
+    steps_list: list[int] = []
+    for start in starts:
+        node, steps = start, 0
+        while steps < budget:
+            node = moves[steps % len(moves)][node]
+            steps += 1
+            if targets[node]:
+                break
+        else:
+            break
+
+        budget -= steps
+        steps_list.append(steps)
+
+    if len(steps_list) < len(starts):
+        table = JumpTable(network, is_target)
+        for start in starts[len(steps_list) :]:
+            steps = table.steps_to_target(start)
+            if steps is None:
+                raise ValueError(f"{network.names[start]} never reaches a target")
+            steps_list.append(steps)
+
+    return steps_list
+
+
+class GhostCycle(NamedTuple):
+    """When a ghost stands on a target, found by walking it until it repeats.
+
+    From `tail` steps on, the walk repeats every `period` steps. `tail_hits` are
+    the steps up to `tail` that arrive on a target, `cycle_hits` those after it,
+    up to `tail + period`, each of which recurs every `period` steps.
+    """
+
+    tail: int
+    period: int
+    tail_hits: list[int]
+    cycle_hits: list[int]
+
+    def hits(self, steps: int) -> bool:
+        if steps <= self.tail:
+            return steps in self.tail_hits
+
+        return any((steps - hit) % self.period == 0 for hit in self.cycle_hits)
+
+
+def analyse_ghost(network: Network, start: int, targets: Sequence[int]) -> GhostCycle:
+    """Walk from `start` until its (node, instruction index) state repeats.
+
+    Only states at the start of an instruction pass are remembered, there are at
+    most as many as nodes, so a ghost takes O(nodes * instructions) steps at most.
+    """
+    moves = network.moves()
+    pass_starts: dict[int, int] = {}
+    hit_steps: list[int] = []
+
+    node, steps = start, 0
+    while node not in pass_starts:
+        pass_starts[node] = steps
+        for move in moves:
+            node = move[node]
+            steps += 1
+            if targets[node]:
+                hit_steps.append(steps)
+
+    tail = pass_starts[node]
+    return GhostCycle(
+        tail,
+        steps - tail,
+        [hit for hit in hit_steps if hit <= tail],
+        [hit for hit in hit_steps if hit > tail],
+    )
+
+
+def combine_congruences(a1: int, m1: int, a2: int, m2: int) -> tuple[int, int] | None:
+    """Solve x = a1 (mod m1) and x = a2 (mod m2) for coprime or not moduli.
+
+    Returns the solutions as (x mod lcm, lcm), or None if there are none.
+    """
+    g = gcd(m1, m2)
+    if (a2 - a1) % g:
+        return None
+
+    m = m1 // g * m2
+    k = (a2 - a1) // g * pow(m1 // g, -1, m2 // g) % (m2 // g)
+
+    return (a1 + k * m1) % m, m
+
+
+def earliest_common_hit(cycles: list[GhostCycle]) -> int | None:
+    """The first step on which every ghost stands on a target, if there is one."""
+    longest = max(cycles, key=lambda cycle: cycle.tail)
+    for hit in longest.tail_hits:
+        if all(cycle.hits(hit) for cycle in cycles):
+            return hit
+
+    # Past every tail, each ghost is on a target exactly when the step is in one
+    # of its hit residue classes, so solve the congruences for each combination
+    classes = {(0, 1)}
+    for cycle in cycles:
+        classes = {
+            combined
+            for a, m in classes
+            for hit in cycle.cycle_hits
+            if (combined := combine_congruences(a, m, hit % cycle.period, cycle.period))
+            is not None
+        }
+
+    if not classes:
+        return None
+
+    first = longest.tail + 1
+    return min(first + (a - first) % m for a, m in classes)
+
+
+class SharedNetwork:
+    """A network's successor arrays, target flags and instructions, copied into
+    one shared memory block that worker processes map instead of unpickling.
+
+    The block holds the left and right arrays (4 bytes per node each), a byte per
+    node for whether it is a target, then the instructions as ASCII.
+    """
 
-    return next_pos.endswith("Z"), next_pos
+    def __init__(self, network: Network, targets: Sequence[int]) -> None:
+        from multiprocessing.shared_memory import SharedMemory
+
+        self.num_nodes = len(network)
+        self.num_instructions = len(network.instructions)
+
+        left, right = memoryview(network.left), memoryview(network.right)
+        self.shm = SharedMemory(
+            create=True,
+            size=left.nbytes + right.nbytes + self.num_nodes + self.num_instructions,
+        )
+
+        buf = self.shm.buf
+        pos = 0
+        for part in (
+            left.cast("B"),
+            right.cast("B"),
+            bytes(targets),
+            network.instructions.encode(),
+        ):
+            buf[pos : pos + len(part)] = part
+            pos += len(part)
+
+    @property
+    def spec(self) -> tuple[str, int, int]:
+        """What a worker needs to attach: (block name, nodes, instructions)."""
+        return self.shm.name, self.num_nodes, self.num_instructions
+
+    @staticmethod
+    def attach(
+        name: str, num_nodes: int, num_instructions: int
+    ) -> tuple["SharedMemory", Network, memoryview]:
+        """Map a block by name, returning it with the network and targets it holds.
+
+        The arrays are views of the block, so they stay valid only while it is open.
+        """
+        from multiprocessing.shared_memory import SharedMemory
+
+        shm = SharedMemory(name=name)
+        nodes_end = 4 * num_nodes
+        left = shm.buf[:nodes_end].cast("i")
+        right = shm.buf[nodes_end : 2 * nodes_end].cast("i")
+        targets = shm.buf[2 * nodes_end : 2 * nodes_end + num_nodes]
+        instructions = bytes(
+            shm.buf[2 * nodes_end + num_nodes :][:num_instructions]
+        ).decode()
 
+        # Names are not shared, the workers only walk by id
+        network = Network(instructions, [], left, right)  # type: ignore[arg-type]
 
-def main():
-    dir_map = {"L": 0, "R": 1}
-    part, mode = get_args()
+        return shm, network, targets
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+
+_worker_network: tuple["SharedMemory", Network, memoryview] | None = None
 
-    if part == 1:
-        lines = read_input(mode)
 
-        directions_line = next(lines)
-        map_lines = (line for line in lines if line != "")
-        map_objs = (parse_line(line) for line in map_lines)
+def _attach_worker(name: str, num_nodes: int, num_instructions: int) -> None:
+    global _worker_network
+    _worker_network = SharedNetwork.attach(name, num_nodes, num_instructions)
+
+
+def _analyse_in_worker(start: int) -> GhostCycle:
+    assert _worker_network is not None, "worker was not attached to a network"
+    _, network, targets = _worker_network
+
+    return analyse_ghost(network, start, targets)
+
+
+def analyse_parallel(
+    network: Network,
+    starts: list[int],
+    targets: Sequence[int],
+    workers: int | None = None,
+) -> list[GhostCycle]:
+    """Analyse every ghost in its own task on a process pool.
+
+    The network is copied into shared memory once, each worker maps it when it
+    starts, so a task only sends its start node and gets its GhostCycle back.
+    """
+    from concurrent.futures import ProcessPoolExecutor
 
-        directions = it.cycle(c for c in directions_line)
-        maps = {key: dirs for key, dirs in map_objs}
+    workers = workers or min(len(starts), os.cpu_count() or 1)
+    shared = SharedNetwork(network, targets)
+    try:
+        with ProcessPoolExecutor(
+            workers, initializer=_attach_worker, initargs=shared.spec
+        ) as pool:
+            return list(pool.map(_analyse_in_worker, starts))
+    finally:
+        shared.close()
 
-        steps_req = 0
-        current_pos = "AAA"
-        while current_pos != "ZZZ":
-            dir_to_take = next(directions)
-            idx = dir_map[dir_to_take]
 
-            next_pos = maps[current_pos][idx]
+def solve(part: int, inp: InputFile) -> int:
+    if part not in (1, 2):
+        raise ValueError(f"Unknown part: {part}")
 
-            current_pos = next_pos
-            steps_req += 1
+    with phase("parse"):
+        network = None
+        # Sizing stdin would read all of it, parse it from the stream instead
+        if inp.path is not None and len(inp.buffer) >= COMPILE_MIN_BYTES:
+            network = Network.from_buffer(inp.buffer)
+        if network is None:
+            network = Network.parse(inp)
 
-        print("SOLUTION:", steps_req)
+    if part == 1:
+        with phase("solve"):
+            (steps_req,) = steps_to_targets(
+                network, [network.ids["AAA"]], lambda name: name == "ZZZ"
+            )
 
-    if part == 2:
-        lines = read_input(mode)
+        return steps_req
 
-        directions_line = next(lines)
-        map_lines = (line for line in lines if line != "")
-        map_objs = (parse_line(line) for line in map_lines)
+    with phase("solve"):
+        targets = [name.endswith("Z") for name in network.names]
+        starts = [node for node, name in enumerate(network.names) if name.endswith("A")]
 
-        directions = it.cycle(directions_line)
-        maps = {key: dirs for key, dirs in map_objs}
+        cells = len(network) * len(network.instructions)
+        if (
+            len(starts) > 1
+            and (os.cpu_count() or 1) > 1
+            and cells >= PARALLEL_MIN_CELLS
+        ):
+            cycles = analyse_parallel(network, starts, targets)
+        else:
+            cycles = [analyse_ghost(network, start, targets) for start in starts]
 
-        step_req_list: list[int] = []
-        current_positions = tuple(key for key in maps.keys() if key.endswith("A"))
-        for current_pos in current_positions:
-            steps_req = 0
-            while not current_pos.endswith("Z"):
-                dir_to_take = next(directions)
-                idx = dir_map[dir_to_take]
+    with phase("aggregate"):
+        solution = earliest_common_hit(cycles)
+        if solution is None:
+            raise ValueError("The ghosts are never all on Z nodes at once")
 
-                next_pos = maps[current_pos][idx]
+    return solution
 
-                current_pos = next_pos
-                steps_req += 1
-            step_req_list.append(steps_req)
 
-        solution = lcm(*step_req_list)
-        print("SOLUTION:", solution)
+def main():
+    part, mode = get_args()
+
+    print("SOLUTION:", solve(part, read_input(__file__, mode)))
 
 
 if __name__ == "__main__":
@@ -1,86 +1,180 @@
+import functools as ft
+import itertools as it
+import math
 import sys
 from pathlib import Path
-from typing import Iterator
-import more_itertools as mit
+from typing import Iterable
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-def get_args() -> tuple[int, str]:
-    if len(sys.argv) != 3:
-        print("Usage: python main.py <1 or 2> <example or full>")
-        sys.exit(1)
+from aoc.io import get_args, read_input  # noqa: E402
+from aoc.profiling import phase  # noqa: E402
 
-    part = int(sys.argv[1])
-    if part not in (1, 2):
-        print("First argument must be either 1 or 2")
-        sys.exit(1)
+# Same-length groups smaller than this are extrapolated one history at a time, for
+# fewer it takes longer to import numpy than to walk the differences
+BATCH_MIN_ROWS = 4096
 
-    mode = sys.argv[2]
-    if mode not in ("example", "full"):
-        print("Second argument must be either example or full")
-        sys.exit(1)
 
-    return part, mode
+def get_diffs(nums: list[int]) -> list[int]:
+    return [b - a for a, b in it.pairwise(nums)]
 
 
-def read_input(name: str) -> Iterator[str]:
-    file_path = Path(__file__).parent / ".." / "input" / name
-    with open(file_path, "r") as f:
-        for line in f:
-            yield line.rstrip()
+def difference_edges(nums: list[int]) -> tuple[list[int], list[int]]:
+    """The first and the last value of every row of differences.
 
+    Rows are taken up to, not including, the first row of all zeros, so the last
+    row is constant and the rows describe the polynomial fitted to the history.
+    """
+    if not nums:
+        raise ValueError("Cannot extrapolate an empty history")
 
-def get_diffs(nums: list[int]) -> list[int]:
-    return [x[1] - x[0] for x in mit.sliding_window(nums, 2)]
+    firsts: list[int] = []
+    lasts: list[int] = []
 
+    diffs = nums
+    while True:
+        firsts.append(diffs[0])
+        lasts.append(diffs[-1])
 
-def main():
-    part, mode = get_args()
+        diffs = get_diffs(diffs)
+        if all(n == 0 for n in diffs):
+            return firsts, lasts
+
+
+def forecast(nums: list[int], steps: int, backward: bool = False) -> list[int]:
+    """The next `steps` values of a history, or the previous ones going backward.
+
+    Only one edge of the difference table is kept. Every value after that adds
+    each row's edge into the row above, bottom up, so a forecast of k values
+    costs O(degree * k) once the table is built.
+    """
+    firsts, lasts = difference_edges(nums)
+    edge = firsts if backward else lasts
+    sign = -1 if backward else 1
+
+    values: list[int] = []
+    for _ in range(steps):
+        for i in range(len(edge) - 2, -1, -1):
+            edge[i] += sign * edge[i + 1]
+        values.append(edge[0])
+
+    return values
+
+
+def forecast_all(
+    histories: Iterable[list[int]], steps: int, backward: bool = False
+) -> list[list[int]]:
+    """`forecast` for every history, e.g. the next 1000 values of every line."""
+    return [forecast(nums, steps, backward) for nums in histories]
+
+
+def extrapolate(nums: list[int]) -> int:
+    """The next value of a history, from its rows of differences."""
+    return forecast(nums, 1)[0]
+
+
+def extrapolate_both(nums: list[int]) -> tuple[int, int]:
+    """The next and the previous value of a history, from one difference table.
+
+    One step forward adds up the last values of every row, one step backward
+    alternates the signs of the first values.
+    """
+    firsts, lasts = difference_edges(nums)
+    prev = sum(-f if i % 2 else f for i, f in enumerate(firsts))
+    return sum(lasts), prev
 
-    if part == 1:
-        total = 0
-        for line in read_input(mode):
-            diff_lines: list[list[int]] = []
 
-            nums = [int(chrs) for chrs in line.split()]
-            diff_lines.append(nums)
+@ft.cache
+def extrapolation_weights(length: int) -> tuple[list[int], list[int]]:
+    """Weights that turn a history of `length` values into its next and previous.
 
-            diffs = get_diffs(nums)
-            diff_lines.append(diffs)
+    Walking the differences back up adds the last value of every row, which
+    works out to sum((-1)**(n-1-i) * comb(n, i) * y[i]) for the next value of
+    y[0..n-1]. Mirrored, the previous value is sum((-1)**i * comb(n, i+1) * y[i]).
+    """
+    next_weights = [
+        (-1) ** (length - 1 - i) * math.comb(length, i) for i in range(length)
+    ]
+    prev_weights = [(-1) ** i * math.comb(length, i + 1) for i in range(length)]
 
-            while not all(n == 0 for n in diffs):
-                diffs = get_diffs(diffs)
-                diff_lines.append(diffs)
+    return next_weights, prev_weights
 
-            diff_lines[-1].append(0)
-            for i in range(len(diff_lines) - 2, -1, -1):
-                x = diff_lines[i + 1][-1] + diff_lines[i][-1]
-                diff_lines[i].append(x)
 
-            total += diff_lines[0][-1]
-        print("SOLUTION:", total)
+def extrapolate_group(rows: list[list[int]]) -> tuple[int, int]:
+    """Sums of the next and previous values of same-length histories.
 
-    if part == 2:
-        total = 0
-        for line in read_input(mode):
-            diff_lines: list[list[int]] = []
+    Both are linear in the histories, so each is the dot product of the column
+    sums with the weights, and the whole group costs one numpy sum. Column sums
+    that could overflow int64 are summed as Python ints instead.
+    """
+    import numpy as np
 
-            nums = list(reversed([int(chrs) for chrs in line.split()]))
-            diff_lines.append(nums)
+    try:
+        values = np.array(rows, dtype=np.int64)
+    except OverflowError:
+        col_sums = [sum(col) for col in zip(*rows)]
+    else:
+        # One more bit of headroom, abs() of the smallest int64 would overflow
+        if int(np.abs(values).max(initial=0)) * len(rows) < 2**62:
+            col_sums = values.sum(axis=0).tolist()
+        else:
+            col_sums = [sum(col) for col in zip(*rows)]
 
-            diffs = get_diffs(nums)
-            diff_lines.append(diffs)
+    next_weights, prev_weights = extrapolation_weights(len(rows[0]))
 
-            while not all(n == 0 for n in diffs):
-                diffs = get_diffs(diffs)
-                diff_lines.append(diffs)
+    return (
+        sum(w * s for w, s in zip(next_weights, col_sums)),
+        sum(w * s for w, s in zip(prev_weights, col_sums)),
+    )
 
-            diff_lines[-1].append(0)
-            for i in range(len(diff_lines) - 2, -1, -1):
-                x = diff_lines[i + 1][-1] + diff_lines[i][-1]
-                diff_lines[i].append(x)
 
-            total += diff_lines[0][-1]
-        print("SOLUTION:", total)
+def extrapolate_all(histories: Iterable[list[int]]) -> tuple[int, int]:
+    """Sums of the next and of the previous values of every history.
+
+    Histories are grouped by length. Big groups go through `extrapolate_group`
+    in one batch, the rest are extrapolated one by one.
+    """
+    groups: dict[int, list[list[int]]] = {}
+    for nums in histories:
+        groups.setdefault(len(nums), []).append(nums)
+
+    next_total = prev_total = 0
+    for rows in groups.values():
+        if len(rows) >= BATCH_MIN_ROWS:
+            next_sum, prev_sum = extrapolate_group(rows)
+        else:
+            next_sum = prev_sum = 0
+            for nums in rows:
+                next_val, prev_val = extrapolate_both(nums)
+                next_sum += next_val
+                prev_sum += prev_val
+
+        next_total += next_sum
+        prev_total += prev_sum
+
+    return next_total, prev_total
+
+
+def solve_both(lines: Iterable[str]) -> tuple[int, int]:
+    """Both parts from a single parse of the histories."""
+    with phase("parse"):
+        histories = [[int(chrs) for chrs in line.split()] for line in lines]
+
+    with phase("solve"):
+        return extrapolate_all(histories)
+
+
+def solve(part: int, lines: Iterable[str]) -> int:
+    if part not in (1, 2):
+        raise ValueError(f"Unknown part: {part}")
+
+    return solve_both(lines)[part - 1]
+
+
+def main():
+    part, mode = get_args()
+
+    print("SOLUTION:", solve(part, read_input(__file__, mode)))
 
 
 if __name__ == "__main__":
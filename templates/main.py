@@ -1,43 +1,32 @@
 import sys
 from pathlib import Path
-from typing import Iterator
+from typing import Iterable
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-def get_args() -> tuple[int, str]:
-    if len(sys.argv) != 3:
-        print("Usage: python main.py <1 or 2> <example or full>")
-        sys.exit(1)
+from aoc.io import get_args, read_input  # noqa: E402
 
-    part = int(sys.argv[1])
-    if part not in (1, 2):
-        print("First argument must be either 1 or 2")
-        sys.exit(1)
 
-    mode = sys.argv[2]
-    if mode not in ("example", "full"):
-        print("Second argument must be either example or full")
-        sys.exit(1)
+def solve(part: int, lines: Iterable[str]) -> int:
+    if part == 1:
+        for line in lines:
+            print(line)
+
+        return 0
 
-    return part, mode
+    if part == 2:
+        for line in lines:
+            print(line)
 
+        return 0
 
-def read_input(name: str) -> Iterator[str]:
-    file_path = Path(__file__).parent / ".." / "input" / name
-    with open(file_path, "r") as f:
-        for line in f:
-            yield line.rstrip()
+    raise ValueError(f"Unknown part: {part}")
 
 
 def main():
     part, mode = get_args()
 
-    if part == 1:
-        for line in read_input(mode):
-            print(line)
-
-    if part == 2:
-        for line in read_input(mode):
-            print(line)
+    print("SOLUTION:", solve(part, read_input(__file__, mode)))
 
 
 if __name__ == "__main__":